@@ -0,0 +1,230 @@
+"""
+Benchmarks for Bernoulli generation, compute_ln_sin_x latency and results
+file throughput.
+
+    python benchmarks/bench.py run --out results.json
+    python benchmarks/bench.py compare benchmarks/baseline.json results.json
+
+Every benchmark reports the median of several repeats in seconds per call,
+each repeat timing enough calls to last at least MIN_SAMPLE_SECONDS, and the
+spread of the repeats (median absolute deviation over the median). Results
+are written as JSON together with metadata about the machine that produced
+them. compare exits with status 1 if any benchmark is slower than the
+baseline by more than the threshold and by more than its own noise.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+FORMAT_VERSION = 1
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Indices up to which the Bernoulli generator is run
+BERNOULLI_INDICES = (100, 200, 400, 800)
+# Arguments near 0, in the middle, near pi/2 and near pi
+SERIES_ARGUMENTS = (1e-3, 0.5, 1.0, math.pi / 2 - 1e-3, math.pi - 1e-3)
+SERIES_PRECISIONS = (1e-2, 1e-5, 1e-10, 1e-15)
+# Number of entries already in the results file before each timed append
+SAVE_SIZES = (0, 1000, 10000)
+SAVE_BATCH = 100
+# Shortest duration of one timed repeat; faster functions are called in a loop
+MIN_SAMPLE_SECONDS = 0.005
+
+def measure_all(functions, repeat, min_time=MIN_SAMPLE_SECONDS):
+    """
+    Times every function after one untimed warm-up call and returns a
+    (median, spread) pair for each: the median seconds per call over repeat
+    samples, each timing as many calls as needed to last at least min_time,
+    and the median absolute deviation of the samples relative to the
+    median. The samples are taken in rounds over all functions, so a slow
+    or fast phase of the machine affects every function alike instead of a
+    few of them.
+    """
+    numbers = []
+    for function in functions:
+        start_time = time.perf_counter()
+        function()
+        first = time.perf_counter() - start_time
+        numbers.append(max(1, math.ceil(min_time / first)) if first > 0 else 1)
+    timings = [[] for _ in functions]
+    for _ in range(repeat):
+        for function, number, samples in zip(functions, numbers, timings):
+            start_time = time.perf_counter()
+            for _ in range(number):
+                function()
+            samples.append((time.perf_counter() - start_time) / number)
+    results = []
+    for samples in timings:
+        median = statistics.median(samples)
+        spread = statistics.median(abs(t - median) for t in samples) / median if median > 0 else 0.0
+        results.append((median, spread))
+    return results
+
+def measure(function, repeat, min_time=MIN_SAMPLE_SECONDS):
+    """
+    Times a single function like measure_all and returns (median, spread).
+    """
+    return measure_all([function], repeat, min_time)[0]
+
+def bench_bernoulli(repeat, indices=BERNOULLI_INDICES):
+    """
+    Times generating B_0 ... B_n with a fresh generator for every n in indices.
+    """
+    functions = [lambda n=n: list(itertools.islice(main.compute_bernoulli_pairs_generator(), n + 1)) for n in indices]
+    return [{'name': 'bernoulli_generator', 'params': {'n': n}, 'seconds': seconds, 'spread': spread}
+            for n, (seconds, spread) in zip(indices, measure_all(functions, repeat))]
+
+def bench_series(repeat, arguments=SERIES_ARGUMENTS, precisions=SERIES_PRECISIONS):
+    """
+    Times compute_ln_sin_x over the grid of arguments and precisions, with
+    the shared coefficient table already warm.
+    """
+    grid = [(x, e) for x in arguments for e in precisions]
+    functions = [lambda x=x, e=e: main.compute_ln_sin_x(x, e) for x, e in grid]
+    return [{'name': 'compute_ln_sin_x', 'params': {'x': x, 'e': e}, 'seconds': seconds, 'spread': spread}
+            for (x, e), (seconds, spread) in zip(grid, measure_all(functions, repeat))]
+
+def bench_save(repeat, sizes=SAVE_SIZES, batch=SAVE_BATCH):
+    """
+    Times appending batch results with save_results_to_file to files that
+    already hold each number of entries in sizes. Every append is timed on
+    its own so the files do not grow much during the benchmark.
+    """
+    session_results = [{'x': 0.5, 'e': 1e-10, 'f_x_e': -0.7351666863853142, 'N': 8}] * batch
+    with tempfile.TemporaryDirectory() as directory:
+        functions = []
+        for size in sizes:
+            filename = os.path.join(directory, f"r{size}")
+            if size:
+                main.save_results_to_file(filename, session_results[:1] * size)
+            functions.append(lambda filename=filename: main.save_results_to_file(filename, session_results))
+        measurements = measure_all(functions, repeat, min_time=0)
+    return [{'name': 'save_results_to_file', 'params': {'size': size, 'batch': batch},
+             'seconds': seconds, 'spread': spread, 'entries_per_second': batch / seconds}
+            for size, (seconds, spread) in zip(sizes, measurements)]
+
+def machine_metadata():
+    """
+    Returns a description of the machine and source tree the benchmarks ran on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': main.np.__version__ if main.np is not None else None,
+        'commit': commit,
+    }
+
+def run_benchmarks(repeat=9):
+    """
+    Runs every benchmark and returns the JSON-serializable report.
+    """
+    benchmarks = bench_bernoulli(repeat) + bench_series(repeat) + bench_save(repeat)
+    return {'version': FORMAT_VERSION, 'metadata': machine_metadata(), 'benchmarks': benchmarks}
+
+def benchmark_key(benchmark):
+    return benchmark['name'], tuple(sorted(benchmark['params'].items()))
+
+def compare_reports(baseline, current, threshold=0.25, min_delta=1e-6, noise=3.0):
+    """
+    Compares two reports and returns (regressions, missing): the benchmarks
+    whose time grew by more than threshold (as a fraction of the baseline),
+    by more than noise times the combined spread of both measurements and
+    by more than min_delta seconds, as (key, baseline seconds, current
+    seconds) tuples, and the keys of the baseline benchmarks that current
+    does not have. The spread makes the noise floor relative to each
+    benchmark; min_delta only guards against timer resolution.
+
+    Raises:
+    ValueError: If either report has an unsupported version.
+
+    """
+    for report in (baseline, current):
+        if report.get('version') != FORMAT_VERSION:
+            raise ValueError("Unsupported benchmark report version.")
+    current_benchmarks = {benchmark_key(b): b for b in current['benchmarks']}
+    regressions = []
+    missing = []
+    for benchmark in baseline['benchmarks']:
+        key = benchmark_key(benchmark)
+        if key not in current_benchmarks:
+            missing.append(key)
+            continue
+        baseline_seconds = benchmark['seconds']
+        current_seconds = current_benchmarks[key]['seconds']
+        # Reports without a spread (best-of timings) get no noise allowance
+        spread = benchmark.get('spread', 0.0) + current_benchmarks[key].get('spread', 0.0)
+        allowed = baseline_seconds * max(threshold, noise * spread)
+        if current_seconds - baseline_seconds > max(allowed, min_delta):
+            regressions.append((key, baseline_seconds, current_seconds))
+    return regressions, missing
+
+def format_key(key):
+    name, params = key
+    return f"{name}(" + ", ".join(f"{param}={value:g}" for param, value in params) + ")"
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for Lab1.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="run the benchmarks and write a JSON report")
+    run_parser.add_argument('--out', default='-', help="report file ('-' for stdout, the default)")
+    run_parser.add_argument('--repeat', type=int, default=9, help="timed repeats per benchmark (default: %(default)s)")
+    compare_parser = subparsers.add_parser('compare', help="flag regressions of a report against a baseline")
+    compare_parser.add_argument('baseline', nargs='?', default=BASELINE_PATH, help="baseline report (default: %(default)s)")
+    compare_parser.add_argument('current', help="report to check")
+    compare_parser.add_argument('--threshold', type=float, default=0.25,
+                                help="allowed slowdown as a fraction of the baseline (default: %(default)s)")
+    compare_parser.add_argument('--min-delta', type=float, default=1e-6,
+                                help="slowdowns below this many seconds are ignored (default: %(default)s)")
+    compare_parser.add_argument('--noise', type=float, default=3.0,
+                                help="slowdowns within this many times the measured spread are ignored "
+                                     "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_benchmarks(args.repeat)
+        if args.out == '-':
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    regressions, missing = compare_reports(baseline, current, args.threshold, args.min_delta, args.noise)
+    for key in missing:
+        print(f"Missing: {format_key(key)}")
+    for key, baseline_seconds, current_seconds in regressions:
+        print(f"Regression: {format_key(key)} {baseline_seconds * 1000:.3f} ms -> {current_seconds * 1000:.3f} ms "
+              f"({current_seconds / baseline_seconds - 1:+.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
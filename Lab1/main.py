@@ -1,23 +1,267 @@
-from decimal import Decimal, getcontext, ROUND_HALF_EVEN
+from decimal import Decimal, localcontext, ROUND_HALF_EVEN
 import re
 import datetime
 import time
 import sys
 import math
+import threading
+import itertools
+import concurrent.futures
+import os
+import json
+import mmap
+import struct
+import zlib
+import argparse
+import csv
+import asyncio
+import queue
+import bisect
+from collections import OrderedDict
+from fractions import Fraction
 
-# Set a default precision; adjust as needed
-getcontext().prec = 50
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by compute_ln_sin_x_batch
+    np = None
+
+# Extra decimal digits carried on top of the size of a Bernoulli numerator
+BERNOULLI_GUARD_DIGITS = 10
+# Minimum number of significant digits of the Bernoulli numbers handed out
+BERNOULLI_RESULT_DIGITS = 50
+
+_pi_cache = [Decimal(3), 1]  # [pi, number of correct digits]
+_pi_lock = threading.Lock()
+
+# Number of loop iterations between two checks of a Deadline
+DEADLINE_CHECK_INTERVAL = 32
+
+class Deadline:
+    """
+    Cooperative time budget and cancellation token, shared by a caller and
+    the long-running loops it starts. The loops check expired() every
+    DEADLINE_CHECK_INTERVAL iterations against the monotonic clock.
+    """
+
+    def __init__(self, seconds=None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def from_value(cls, deadline):
+        """
+        Returns deadline itself if it is a Deadline or None, otherwise a new
+        Deadline expiring after that many seconds.
+        """
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def cancel(self):
+        """
+        Makes the deadline expire immediately, from any thread.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """
+        Returns the number of seconds left, or None if there is no time limit.
+        """
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self):
+        """
+        Returns True once the deadline has passed or was cancelled.
+        """
+        return self.cancelled or (self.expires_at is not None and time.monotonic() >= self.expires_at)
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised by the shared tables when a Deadline expires while they are
+    being extended.
+    """
+
+class PartialResult(tuple):
+    """
+    (f_x_e, N) pair returned when a Deadline expires before precision e is
+    reached. N is the number of terms actually summed and error_bound is an
+    upper bound on |f_x_e - ln|sin(x)|| for that N.
+    """
+
+    def __new__(cls, f_x_e, N, error_bound):
+        result = super().__new__(cls, (f_x_e, N))
+        result.error_bound = error_bound
+        return result
+
+class Metrics:
+    """
+    Opt-in per-stage timers and counters of the hot paths. While disabled,
+    instrumented code only pays for one attribute check. If a callback is
+    set, it is called as callback(kind, name, value) for every sample, with
+    kind 'timer' (value in seconds) or 'counter'.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.callback = None
+        self._lock = threading.Lock()
+        self.timers = {}  # stage -> total seconds
+        self.counters = {}  # name -> total count
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+        if self.callback is not None:
+            self.callback('timer', stage, seconds)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        if self.callback is not None:
+            self.callback('counter', name, amount)
+
+    def snapshot(self):
+        """
+        Returns a copy of the totals as {'timers': {...}, 'counters': {...}}.
+        """
+        with self._lock:
+            return {'timers': dict(self.timers), 'counters': dict(self.counters)}
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+
+# Metrics of the Bernoulli and series stages, shared by every thread
+METRICS = Metrics()
+
+def enable_metrics(callback=None):
+    """
+    Starts recording metrics, optionally reporting every sample to callback.
+    """
+    METRICS.callback = callback
+    METRICS.enabled = True
+
+def disable_metrics():
+    """
+    Stops recording metrics; the totals so far are kept.
+    """
+    METRICS.enabled = False
+    METRICS.callback = None
+
+def stats():
+    """
+    Returns a snapshot of the recorded timers and counters.
+    """
+    return METRICS.snapshot()
+
+def reset_stats():
+    """
+    Sets every recorded timer and counter back to zero.
+    """
+    METRICS.reset()
+
+def format_stats(snapshot):
+    """
+    Formats a stats() snapshot as one indented line per timer and counter.
+    """
+    lines = [f"  {stage}: {seconds * 1000:.3f} ms" for stage, seconds in sorted(snapshot['timers'].items())]
+    lines += [f"  {name}: {count}" for name, count in sorted(snapshot['counters'].items())]
+    return "\n".join(lines)
+
+def divisors(n):
+    """
+    Generator that yields every divisor of n >= 1, in no particular order.
+    """
+    for k in range(1, math.isqrt(n) + 1):
+        if n % k == 0:
+            yield k
+            if k != n // k:
+                yield n // k
+
+class PrimeSieve:
+    """
+    Thread-safe Sieve of Eratosthenes that grows on demand.
+
+    Only odd numbers are sieved, one byte each in a bytearray, and the sieve
+    is extended one segment of SEGMENT_SIZE odd numbers at a time using the
+    primes already found, so extending it never sieves from 2 again. The
+    primes found so far are kept in the sorted list primes, which only ever
+    grows.
+    """
+
+    SEGMENT_SIZE = 1 << 16
+
+    def __init__(self, limit=0):
+        self._lock = threading.Lock()
+        self._flags = bytearray(1)  # Flag of the odd number 2i + 1 at index i; 1 is not prime
+        self.primes = [2]
+        self.limit = 2  # Every prime up to limit is known
+        self.extend(limit)
+
+    def __contains__(self, m):
+        return self.is_prime(m)
+
+    def is_prime(self, m):
+        """
+        Returns True if m is prime. m must not exceed limit.
+        """
+        if m % 2 == 0:
+            return m == 2
+        return m > 0 and self._flags[m // 2] == 1
+
+    def extend(self, limit):
+        """
+        Makes sure every prime up to limit is known.
+        """
+        if limit <= self.limit:
+            return
+        with self._lock:
+            while self.limit < limit:
+                low = 2 * len(self._flags) + 1  # First odd number not sieved yet
+                # Segments stop below (low - 1)^2, so every prime needed to
+                # sieve them is already in self.primes
+                high = min(low + 2 * (self.SEGMENT_SIZE - 1), (low - 1) ** 2 - 1, limit | 1)
+                count = (high - low) // 2 + 1
+                segment = bytearray(b'\x01') * count
+                for p in itertools.islice(self.primes, 1, None):
+                    if p * p > high:
+                        break
+                    start = max(p * p, (low + p - 1) // p * p)
+                    if start % 2 == 0:
+                        start += p
+                    first = (start - low) // 2
+                    if first < count:
+                        segment[first::p] = bytes((count - 1 - first) // p + 1)
+                self.primes.extend(low + 2 * i for i in itertools.compress(range(count), segment))
+                self._flags += segment
+                self.limit = high
+
+    def primes_up_to(self, bound):
+        """
+        Returns an iterator over the primes up to bound, in increasing order.
+        """
+        self.extend(bound)
+        return itertools.islice(self.primes, bisect.bisect_right(self.primes, bound))
+
+
+# Primes shared by every Bernoulli computation
+PRIME_SIEVE = PrimeSieve()
 
 def prime_sieve(n):
     """
     Returns a list of prime numbers up to n using Sieve of Eratosthenes.
     """
-    sieve = [True] * (n + 1)
-    sieve[0:2] = [False, False]
-    for current in range(2, int(n ** 0.5) + 1):
-        if sieve[current]:
-            sieve[current*2::current] = [False] * len(sieve[current*2::current])
-    return [num for num, is_prime in enumerate(sieve) if is_prime]
+    return list(PRIME_SIEVE.primes_up_to(n))
 
 def decimal_factorial(n):
     """
@@ -28,162 +272,1709 @@ def decimal_factorial(n):
         result *= Decimal(i)
     return result
 
-def compute_bernoulli_numbers_generator():
-    """
-    Generator function that yields Bernoulli numbers B_n one at a time,
-    using the McGown algorithm and Decimal for high-precision arithmetic.
-    """
-    n = 0
-    primes = []
-    while True:
-        if n == 0:
-            B_n = Decimal(1)
-        elif n == 1:
-            B_n = Decimal('-0.5')
-        elif (n - 1) % 2 == 0:
-            B_n = Decimal(0)
-        else:
-            # Ensure the primes list contains all primes up to n+1
-            max_prime_needed = n + 1
-            if not primes or primes[-1] < max_prime_needed:
-                # Extend the primes list
-                primes = prime_sieve(max_prime_needed)
-            n_decimal = Decimal(n)
-            two_pi = Decimal('6.2831853071795864769252867665590057683943387987502')  # 2*pi
-            factorial_n = decimal_factorial(n)
-            K = Decimal(2) * factorial_n / (two_pi ** n_decimal)
-            d = Decimal(1)
-            for p in primes:
-                if n % (p - 1) == 0:
-                    d *= Decimal(p)
-            N = math.ceil((K * d) ** (Decimal(1) / (n - 1)))
-            z = Decimal(1)
-            for p in primes:
-                if p <= N:
-                    z *= Decimal(1) / (1 - Decimal(1) / (Decimal(p) ** n_decimal))
-            sign = Decimal(-1) ** (n // 2 + 1)
-            a = sign * d * K * z
-            a = a.to_integral_exact(rounding=ROUND_HALF_EVEN)
-            if a == 0:
-                a = Decimal((-1) ** (n // 2 + 1))
-            B_n = a / d
-        yield B_n
-        n += 1
+def compute_pi(digits):
+    """
+    Returns pi rounded to the given number of significant digits.
+    The most precise value computed so far is cached and rounded down for
+    smaller requests.
+    """
+    with _pi_lock:
+        cached_pi, cached_digits = _pi_cache
+        if cached_digits < digits:
+            with localcontext() as ctx:
+                ctx.prec = digits + 2
+                three = Decimal(3)
+                lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+                while s != lasts:
+                    lasts = s
+                    n, na = n + na, na + 8
+                    d, da = d + da, da + 32
+                    t = (t * n) / d
+                    s += t
+            cached_pi, cached_digits = s, digits
+            _pi_cache[:] = [cached_pi, cached_digits]
+    with localcontext() as ctx:
+        ctx.prec = digits
+        return +cached_pi
+
+def decimal_cos(theta):
+    """
+    Returns cos(theta) in the current Decimal context, from its Taylor series.
+    """
+    with localcontext() as ctx:
+        ctx.prec += 5
+        threshold = Decimal(10) ** -(ctx.prec + 2)
+        cos_theta, term, k = Decimal(1), Decimal(1), 0
+        while abs(term) > threshold:
+            term = -term * theta * theta / ((k + 1) * (k + 2))
+            cos_theta += term
+            k += 2
+    return +cos_theta
+
+def bernoulli_precision(n, d):
+    """
+    Returns the number of significant decimal digits needed to compute the
+    numerator a = B_n * d of an even-index Bernoulli number exactly, derived
+    from the size of d * 2 * n! / (2*pi)^n.
+    """
+    log_a = math.log(2 * d) + math.lgamma(n + 1) - n * math.log(2 * math.pi)
+    digits = max(math.ceil(log_a / math.log(10)), 1)
+    # Rounding errors accumulate over about n operations
+    return digits + len(str(n)) + BERNOULLI_GUARD_DIGITS
+
+def decimal_log_abs(value):
+    """
+    Returns ln|value| as a float for a non-zero Decimal of any magnitude,
+    without converting the (possibly overflowing) value itself to float.
+    """
+    exponent = value.adjusted()
+    mantissa = float(abs(value).scaleb(-exponent))
+    return math.log(mantissa) + exponent * math.log(10)
+
+def von_staudt_clausen_denominator(n, prime_set):
+    """
+    Returns the denominator of B_n for even n >= 2, i.e. the product of the
+    primes p such that (p - 1) divides n (von Staudt-Clausen theorem).
+    Only the divisors of n are examined, so prime_set (a set or a PrimeSieve)
+    must contain every prime up to n + 1.
+    """
+    d = 1
+    for divisor in divisors(n):
+        if divisor + 1 in prime_set:
+            d *= divisor + 1
+    return d
+
+def zeta_product_bound(n, K, d):
+    """
+    Returns the largest prime bound N = ceil((K*d)^(1/(n-1))) needed in the
+    zeta product of the McGown algorithm, evaluated with logarithms.
+    """
+    return math.ceil(math.exp(decimal_log_abs(K * d) / (n - 1)))
+
+def mcgown_numerator(n, K, d, z):
+    """
+    Finishes the McGown algorithm for even n >= 2: rounds sign * d * K * z
+    to the integer numerator a of B_n = a / d.
+    """
+    sign = Decimal(-1) ** (n // 2 + 1)
+    a = sign * d * K * z
+    a = a.to_integral_exact(rounding=ROUND_HALF_EVEN)
+    if a == 0:
+        a = Decimal((-1) ** (n // 2 + 1))
+    return a
+
+def bernoulli_pair_to_decimal(n, numerator, denominator):
+    """
+    Converts the exact fraction B_n = numerator / denominator to a Decimal
+    carrying at least BERNOULLI_RESULT_DIGITS significant digits.
+    """
+    if n < 2 or numerator == 0:
+        return Decimal(numerator) / Decimal(denominator)
+    with localcontext() as ctx:
+        ctx.prec = max(bernoulli_precision(n, denominator), BERNOULLI_RESULT_DIGITS)
+        return Decimal(numerator) / Decimal(denominator)
+
+def compute_bernoulli_pairs_generator(start=0, deadline=None):
+    """
+    Generator function that yields the Bernoulli numbers B_start, B_start+1, ...
+    as exact (numerator, denominator) pairs of integers, using the McGown
+    algorithm and Decimal for high-precision arithmetic.
+
+    n!, (2*pi)^n, the prime list and the prime powers p^n used by the zeta
+    product are carried forward from one index to the next, so each new
+    B_n only costs a few multiplications per prime. Each B_n is computed in
+    a local Decimal context sized by bernoulli_precision; the carried values
+    are recomputed with 25% headroom whenever that precision runs out.
+    If a deadline (a Deadline or a number of seconds) expires, the generator
+    stops early.
+    """
+    deadline = Deadline.from_value(deadline)
+    working_prec = 0  # Precision of the carried values below
+    two_pi = None
+    factorial_n = Decimal(1)  # n! as of the last even n
+    two_pi_n = Decimal(1)  # (2*pi)^n as of the last even n
+    sieve = PRIME_SIEVE
+    primes = sieve.primes  # Grows in place as the sieve is extended
+    prime_powers = []  # p^n for the first len(prime_powers) primes, as of the last even n
+    n = start
+    while True:
+        if deadline is not None and (n - start) % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+            return
+        if n == 0:
+            pair = (1, 1)
+        elif n == 1:
+            pair = (-1, 2)
+        elif (n - 1) % 2 == 0:
+            pair = (0, 1)
+        else:
+            metrics = METRICS.enabled
+            # Ensure the primes list contains all primes up to n+1
+            max_prime_needed = n + 1
+            if sieve.limit < max_prime_needed:
+                # Extend the sieve, doubling the bound so it is extended rarely
+                stage_start = time.perf_counter() if metrics else None
+                sieve.extend(2 * max_prime_needed)
+                if metrics:
+                    METRICS.add_time('prime_sieve', time.perf_counter() - stage_start)
+                    METRICS.count('sieve_extensions')
+            d_int = von_staudt_clausen_denominator(n, sieve)
+            prec = bernoulli_precision(n, d_int)
+            with localcontext() as ctx:
+                if prec > working_prec:
+                    working_prec = prec + prec // 4
+                    ctx.prec = working_prec
+                    two_pi = 2 * compute_pi(working_prec)
+                    stage_start = time.perf_counter() if metrics else None
+                    factorial_n = decimal_factorial(n)
+                    if metrics:
+                        METRICS.add_time('decimal_factorial', time.perf_counter() - stage_start)
+                    two_pi_n = two_pi ** n
+                    prime_powers = [Decimal(p) ** n for p in primes[:len(prime_powers)]]
+                else:
+                    # Advance the carried values from n - 2 to n
+                    ctx.prec = working_prec
+                    factorial_n *= (n - 1) * n
+                    two_pi_n *= two_pi * two_pi
+                    for i, p in enumerate(primes[:len(prime_powers)]):
+                        prime_powers[i] *= p * p
+                K = Decimal(2) * factorial_n / two_pi_n
+                d = Decimal(d_int)
+                stage_start = time.perf_counter() if metrics else None
+                N = zeta_product_bound(n, K, d)
+                while len(prime_powers) < len(primes) and primes[len(prime_powers)] <= N:
+                    prime_powers.append(Decimal(primes[len(prime_powers)]) ** n)
+                # z = prod 1 / (1 - p^-n) = prod p^n / prod (p^n - 1), over primes p <= N
+                z_numerator = Decimal(1)
+                z_denominator = Decimal(1)
+                for p, p_n in zip(primes, prime_powers):
+                    if p > N:
+                        break
+                    z_numerator *= p_n
+                    z_denominator *= p_n - 1
+                z = z_numerator / z_denominator
+                if metrics:
+                    METRICS.add_time('zeta_product', time.perf_counter() - stage_start)
+                pair = (int(mcgown_numerator(n, K, d, z)), d_int)
+        yield pair
+        n += 1
+
+def compute_bernoulli_numbers_generator(start=0, deadline=None):
+    """
+    Generator function that yields Bernoulli numbers B_n one at a time,
+    starting from B_start, as Decimals carrying at least
+    BERNOULLI_RESULT_DIGITS significant digits. Stops early if deadline expires.
+    """
+    n = start
+    for numerator, denominator in compute_bernoulli_pairs_generator(start, deadline):
+        yield bernoulli_pair_to_decimal(n, numerator, denominator)
+        n += 1
+
+def bernoulli_pair(n):
+    """
+    Computes a single Bernoulli number B_n directly with the McGown algorithm,
+    without generating any of the preceding numbers.
+
+    Parameters:
+    n (int): The index of the Bernoulli number (n >= 0).
+
+    Returns:
+    tuple: The exact (numerator, denominator) pair of B_n.
+
+    Raises:
+    ValueError: If n is negative.
+
+    """
+    if n < 0:
+        raise ValueError("Bernoulli index must be non-negative.")
+    if n == 0:
+        return 1, 1
+    if n == 1:
+        return -1, 2
+    if n % 2 == 1:
+        return 0, 1
+    if PRIME_SIEVE.limit < n + 1:
+        stage_start = time.perf_counter() if METRICS.enabled else None
+        PRIME_SIEVE.extend(n + 1)
+        if stage_start is not None:
+            METRICS.add_time('prime_sieve', time.perf_counter() - stage_start)
+            METRICS.count('sieve_extensions')
+    d_int = von_staudt_clausen_denominator(n, PRIME_SIEVE)
+    prec = bernoulli_precision(n, d_int)
+    with localcontext() as ctx:
+        ctx.prec = prec
+        K = Decimal(2) * decimal_factorial(n) / (2 * compute_pi(prec)) ** n
+        d = Decimal(d_int)
+        N = zeta_product_bound(n, K, d)
+        z = Decimal(1)
+        for p in PRIME_SIEVE.primes_up_to(n + 1):
+            if p > N:
+                break
+            p_n = Decimal(p) ** n
+            z *= p_n / (p_n - 1)
+        return int(mcgown_numerator(n, K, d, z)), d_int
+
+def bernoulli(n):
+    """
+    Computes a single Bernoulli number B_n directly, like bernoulli_pair,
+    and returns it as a Decimal.
+    """
+    return bernoulli_pair_to_decimal(n, *bernoulli_pair(n))
+
+def bernoulli_list(indices):
+    """
+    Computes bernoulli(n) for every n in indices; the unit of work
+    bernoulli_range hands to a worker process.
+    """
+    return [bernoulli(n) for n in indices]
+
+def bernoulli_range(a, b, workers=None):
+    """
+    Computes the Bernoulli numbers B_a, ..., B_{b-1}, distributing the even
+    indices over a pool of worker processes.
+
+    Parameters:
+    a (int): The first index (a >= 0).
+    b (int): The index after the last one.
+    workers (int): The number of worker processes; defaults to the number
+        of CPUs. With workers=1 everything is computed in this process.
+
+    Returns:
+    list: The Bernoulli numbers in index order.
+
+    Raises:
+    ValueError: If the range or the number of workers is invalid.
+
+    """
+    if a < 0 or b < a:
+        raise ValueError("Bernoulli index range must satisfy 0 <= a <= b.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    # Odd indices above 1 are zero and not worth shipping to a worker
+    heavy_indices = [n for n in range(max(a, 2), b) if n % 2 == 0]
+    if workers == 1 or len(heavy_indices) < 2:
+        # Walking the incremental generator is cheapest in a single process
+        return list(itertools.islice(compute_bernoulli_numbers_generator(a), b - a))
+    # Interleave the indices round-robin, so every chunk gets a mix of cheap
+    # and costly ones instead of a contiguous run of ascending cost
+    chunk_count = min(len(heavy_indices), workers * 8)
+    chunks = [heavy_indices[i::chunk_count] for i in range(chunk_count)]
+    computed = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk, values in zip(chunks, executor.map(bernoulli_list, chunks)):
+            computed.update(zip(chunk, values))
+    return [computed[n] if n in computed else bernoulli(n) for n in range(a, b)]
+
+class BernoulliFile:
+    """
+    Read-only, memory-mapped view of a Bernoulli table file written by
+    build_bernoulli_file. Records are decoded lazily, only for the indices
+    that are actually requested.
+
+    File layout (all integers little-endian):
+        header:  magic b'BERN', version (u16), reserved (u16), count (u32),
+                 CRC-32 of the offset index (u32)
+        index:   count + 1 offsets (u64) of the records, relative to the
+                 end of the index; the last one is the end of the data
+        records: for B_0 ... B_{count-1}: numerator length (u32), numerator
+                 (signed), denominator length (u32), denominator (unsigned),
+                 CRC-32 of the record so far (u32)
+    """
+
+    MAGIC = b'BERN'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHII')
+    LENGTH = struct.Struct('<I')
+    OFFSET = struct.Struct('<Q')
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < self.HEADER.size:
+                raise ValueError("Bernoulli table file is truncated.")
+            magic, version, _, count, index_crc = self.HEADER.unpack_from(self._mmap, 0)
+            if magic != self.MAGIC:
+                raise ValueError("Not a Bernoulli table file.")
+            if version != self.VERSION:
+                raise ValueError("Unsupported Bernoulli table file version.")
+            index_end = self.HEADER.size + 8 * (count + 1)
+            if len(self._mmap) < index_end:
+                raise ValueError("Bernoulli table file is truncated.")
+            index = self._mmap[self.HEADER.size:index_end]
+            if zlib.crc32(index) != index_crc:
+                raise ValueError("Bernoulli table index checksum mismatch.")
+            # Decoded per lookup: a native memoryview cast would misread the
+            # little-endian offsets on big-endian hosts
+            self._index = index
+            if index_end + self._offset(count) != len(self._mmap):
+                raise ValueError("Bernoulli table file is truncated.")
+        except Exception:
+            self._mmap.close()
+            raise
+        self._data_start = index_end
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, n):
+        return self.OFFSET.unpack_from(self._index, 8 * n)[0]
+
+    def pair(self, n):
+        """
+        Decodes and returns the exact (numerator, denominator) pair of B_n.
+
+        Raises:
+        IndexError: If n is not stored in the file.
+        ValueError: If the record fails its checksum.
+
+        """
+        if not 0 <= n < self.count:
+            raise IndexError("Bernoulli index not stored in the table file.")
+        start = self._data_start + self._offset(n)
+        end = self._data_start + self._offset(n + 1)
+        record = self._mmap[start:end]
+        (crc,) = self.LENGTH.unpack_from(record, len(record) - 4)
+        if zlib.crc32(record[:-4]) != crc:
+            raise ValueError(f"Bernoulli table record {n} checksum mismatch.")
+        (numerator_length,) = self.LENGTH.unpack_from(record, 0)
+        position = 4 + numerator_length
+        numerator = int.from_bytes(record[4:position], 'little', signed=True)
+        (denominator_length,) = self.LENGTH.unpack_from(record, position)
+        denominator = int.from_bytes(record[position + 4:position + 4 + denominator_length], 'little')
+        return numerator, denominator
+
+    def get(self, n):
+        """
+        Returns B_n as a Decimal, like compute_bernoulli_numbers_generator.
+        """
+        return bernoulli_pair_to_decimal(n, *self.pair(n))
+
+    def close(self):
+        self._mmap.close()
+
+def build_bernoulli_file(filename, count):
+    """
+    Computes B_0 ... B_{count-1} and writes them to a Bernoulli table file
+    (see BernoulliFile). The file is written next to its final location
+    and moved into place atomically.
+
+    Returns:
+    int: The number of Bernoulli numbers stored.
+
+    """
+    if count < 1:
+        raise ValueError("The table must hold at least one Bernoulli number.")
+    records = []
+    offsets = [0]
+    pairs = compute_bernoulli_pairs_generator()
+    for _ in range(count):
+        numerator, denominator = next(pairs)
+        numerator_bytes = numerator.to_bytes((numerator.bit_length() + 8) // 8, 'little', signed=True)
+        denominator_bytes = denominator.to_bytes((denominator.bit_length() + 7) // 8, 'little')
+        record = (BernoulliFile.LENGTH.pack(len(numerator_bytes)) + numerator_bytes
+                  + BernoulliFile.LENGTH.pack(len(denominator_bytes)) + denominator_bytes)
+        record += BernoulliFile.LENGTH.pack(zlib.crc32(record))
+        records.append(record)
+        offsets.append(offsets[-1] + len(record))
+    index = struct.pack(f'<{len(offsets)}Q', *offsets)
+    header = BernoulliFile.HEADER.pack(BernoulliFile.MAGIC, BernoulliFile.VERSION, 0, count, zlib.crc32(index))
+    tmp_name = filename + '.tmp'
+    with open(tmp_name, 'wb') as f:
+        f.write(header)
+        f.write(index)
+        f.write(b''.join(records))
+    os.replace(tmp_name, filename)
+    return count
+
+def open_bernoulli_file(filename):
+    """
+    Memory-maps the Bernoulli table file, returning None if it does not
+    exist or is not a valid table.
+    """
+    try:
+        return BernoulliFile(filename)
+    except (OSError, ValueError):
+        return None
+
+
+# Default location of the persistent Bernoulli table; built with
+# python main.py --build-bernoulli-table COUNT
+BERNOULLI_FILE_PATH = os.environ.get(
+    'LAB1_BERNOULLI_TABLE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bernoulli_table.bin'))
+BERNOULLI_FILE = open_bernoulli_file(BERNOULLI_FILE_PATH)
+
+class BernoulliTable:
+    """
+    Thread-safe table of Bernoulli numbers that grows on demand.
+
+    A single instance is shared by every call to compute_ln_sin_x, so the
+    Bernoulli numbers are generated only once per process. Numbers stored in
+    bernoulli_file (a BernoulliFile, by default the persistent table loaded
+    at import) are decoded from it; the generator only computes the ones
+    beyond its range.
+
+    Memory is capped with max_bytes: since B_n has about n*log(n) digits,
+    the least recently used entries are evicted once the values take more
+    than max_bytes (as measured by sys.getsizeof), always keeping the most
+    recent one. max_entries additionally limits the number of entries.
+    Evicted numbers are regenerated on demand.
+    """
+
+    def __init__(self, max_entries=None, bernoulli_file=None, max_bytes=None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be a positive integer or None.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer or None.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bernoulli_file = bernoulli_file
+        self.size_bytes = 0  # Total size of the stored values
+        self._lock = threading.RLock()
+        self._values = OrderedDict()  # index -> B_n, in LRU order
+        self._generator = None
+        self._next_index = 0  # Index the generator will yield next
+
+    def __len__(self):
+        with self._lock:
+            return len(self._values)
+
+    def __contains__(self, n):
+        with self._lock:
+            return n in self._values
+
+    def get(self, n, deadline=None):
+        """
+        Returns B_n, generating it (and every B_k for k < n not yet generated)
+        if it is not in the table.
+
+        Raises:
+        DeadlineExceeded: If deadline expires while generating; the numbers
+            generated so far are kept.
+
+        """
+        if n < 0:
+            raise ValueError("Bernoulli index must be non-negative.")
+        with self._lock:
+            value = self._values.get(n)
+            if value is not None:
+                if METRICS.enabled:
+                    METRICS.count('bernoulli_cache_hits')
+                self._values.move_to_end(n)
+                return value
+            metrics = METRICS.enabled
+            if metrics:
+                METRICS.count('bernoulli_cache_misses')
+            if self.bernoulli_file is not None and n < len(self.bernoulli_file):
+                value = self.bernoulli_file.get(n)
+                self._store(n, value)
+                if metrics:
+                    METRICS.count('bernoulli_file_reads')
+                return value
+            stage_start = time.perf_counter() if metrics else None
+            if self._generator is not None and n < self._next_index:
+                # The value was evicted: compute it directly instead of replaying the generator
+                value = bernoulli(n)
+                self._store(n, value)
+                if metrics:
+                    METRICS.add_time('bernoulli_generation', time.perf_counter() - stage_start)
+                return value
+            if self._generator is None:
+                # Only extend beyond what the file already stores
+                self._next_index = len(self.bernoulli_file) if self.bernoulli_file is not None else 0
+                self._generator = compute_bernoulli_numbers_generator(self._next_index)
+            for step in itertools.count():
+                if self._next_index > n:
+                    break
+                if deadline is not None and step % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                    raise DeadlineExceeded("Deadline expired while generating Bernoulli numbers.")
+                value = next(self._generator)
+                self._store(self._next_index, value)
+                self._next_index += 1
+            if metrics:
+                METRICS.add_time('bernoulli_generation', time.perf_counter() - stage_start)
+            self._values.move_to_end(n)
+            return self._values[n]
+
+    def ensure(self, n):
+        """
+        Makes sure B_0 ... B_n have been generated.
+        """
+        self.get(n)
+
+    def clear(self):
+        """
+        Drops every cached Bernoulli number.
+        """
+        with self._lock:
+            self._values.clear()
+            self.size_bytes = 0
+            self._generator = None
+            self._next_index = 0
+
+    def use_file(self, bernoulli_file):
+        """
+        Switches to another BernoulliFile (or None) and drops every cached number.
+        """
+        with self._lock:
+            self.bernoulli_file = bernoulli_file
+            self.clear()
+
+    def _store(self, n, value):
+        old_value = self._values.pop(n, None)
+        if old_value is not None:
+            self.size_bytes -= sys.getsizeof(old_value)
+        self._values[n] = value
+        self.size_bytes += sys.getsizeof(value)
+        while len(self._values) > 1 and (
+                (self.max_entries is not None and len(self._values) > self.max_entries)
+                or (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+            _, evicted = self._values.popitem(last=False)
+            self.size_bytes -= sys.getsizeof(evicted)
+
+
+# Bernoulli numbers shared by every compute_ln_sin_x call and every thread
+BERNOULLI_TABLE = BernoulliTable(bernoulli_file=BERNOULLI_FILE)
+
+class BernoulliEngine:
+    """
+    Base class of the exact Bernoulli number backends. An engine returns
+    exact (numerator, denominator) pairs for a list of indices and estimates
+    how long a request of a given shape takes from its cost model
+    (coefficient, exponent), fitted by benchmark_bernoulli_engines.
+    """
+
+    name = None
+
+    def available(self, max_index):
+        """
+        Returns True if the engine can serve indices up to max_index.
+        """
+        return True
+
+    def pairs(self, indices, deadline=None):
+        """
+        Returns the exact (numerator, denominator) pair of B_n for every n in indices.
+
+        Raises:
+        DeadlineExceeded: If deadline expires before every pair is computed.
+
+        """
+        raise NotImplementedError
+
+    def fractions(self, indices, deadline=None):
+        """
+        Returns B_n as a Fraction for every n in indices.
+        """
+        return [Fraction(numerator, denominator) for numerator, denominator in self.pairs(indices, deadline)]
+
+    def estimate(self, max_index, count, model):
+        """
+        Estimates the seconds needed for count indices up to max_index.
+        """
+        coefficient, exponent = model[self.name]
+        return count * coefficient * max(max_index, 1) ** exponent
+
+class McGownEngine(BernoulliEngine):
+    """
+    Computes every requested index independently with the McGown zeta
+    method (bernoulli_pair); best for a few large indices.
+    """
+
+    name = 'mcgown'
+
+    def pairs(self, indices, deadline=None):
+        pairs = []
+        for n in indices:
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded("Deadline expired while computing Bernoulli numbers.")
+            pairs.append(bernoulli_pair(n))
+        return pairs
+
+class TangentNumberEngine(BernoulliEngine):
+    """
+    Computes every index up to the largest requested one from the tangent
+    numbers T_k with the Brent-Harvey recurrence on Python integers, using
+    B_2k = (-1)^(k-1) * 2k * T_k / (4^k * (4^k - 1)); best for dense ranges.
+    """
+
+    name = 'tangent'
+
+    def pairs(self, indices, deadline=None):
+        indices = list(indices)
+        m = max((n // 2 for n in indices), default=0)
+        T = [0] * (m + 1)  # T[k] is the k-th tangent number; T[0] is unused
+        if m >= 1:
+            T[1] = 1
+        for k in range(2, m + 1):
+            T[k] = (k - 1) * T[k - 1]
+        for k in range(2, m + 1):
+            # Each pass costs O(m) big-integer operations
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded("Deadline expired while computing Bernoulli numbers.")
+            for j in range(k, m + 1):
+                T[j] = (j - k) * T[j - 1] + (j - k + 2) * T[j]
+        pairs = []
+        for step, n in enumerate(indices):
+            if deadline is not None and step % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                raise DeadlineExceeded("Deadline expired while computing Bernoulli numbers.")
+            if n < 0:
+                raise ValueError("Bernoulli index must be non-negative.")
+            if n < 2 or n % 2 == 1:
+                pairs.append(bernoulli_pair(n))
+            else:
+                k = n // 2
+                B_n = Fraction((-1) ** (k - 1) * 2 * k * T[k], 4 ** k * (4 ** k - 1))
+                pairs.append((B_n.numerator, B_n.denominator))
+        return pairs
+
+    def estimate(self, max_index, count, model):
+        # The whole range up to max_index is computed whatever the count
+        coefficient, exponent = model[self.name]
+        return coefficient * max(max_index, 1) ** exponent
+
+class TableEngine(BernoulliEngine):
+    """
+    Decodes the requested indices from a persistent Bernoulli table file
+    (by default the one BERNOULLI_TABLE currently uses, so --bernoulli-table
+    switches both); only available for indices the file stores.
+    """
+
+    name = 'table'
+
+    def __init__(self, bernoulli_file=None):
+        self._bernoulli_file = bernoulli_file
+
+    @property
+    def bernoulli_file(self):
+        return self._bernoulli_file if self._bernoulli_file is not None else BERNOULLI_TABLE.bernoulli_file
+
+    def available(self, max_index):
+        return self.bernoulli_file is not None and max_index < len(self.bernoulli_file)
+
+    def pairs(self, indices, deadline=None):
+        bernoulli_file = self.bernoulli_file
+        if bernoulli_file is None:
+            raise ValueError("No Bernoulli table file is loaded.")
+        pairs = []
+        for step, n in enumerate(indices):
+            if deadline is not None and step % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                raise DeadlineExceeded("Deadline expired while computing Bernoulli numbers.")
+            pairs.append(bernoulli_file.pair(n))
+        return pairs
+
+
+# Registered engines by name; add custom BernoulliEngine subclasses here
+BERNOULLI_ENGINES = {engine.name: engine for engine in (McGownEngine(), TangentNumberEngine(), TableEngine())}
+
+# Cost models (coefficient, exponent) fitted by benchmark_bernoulli_engines
+# on the reference machine; calibrate_bernoulli_engines refits them locally
+BERNOULLI_ENGINE_MODEL = {
+    'mcgown': (5.4e-08, 1.60),
+    'tangent': (2.0e-09, 2.53),
+    'table': (2.0e-06, 0.10),
+}
+
+def benchmark_bernoulli_engines(max_indices=(100, 200, 400, 800), engines=None, repeat=3):
+    """
+    Times every engine on requests of growing size (best of repeat runs,
+    after a warm-up run) and fits a cost model
+    cost = coefficient * max_index ** exponent to the measurements: per index
+    for 'mcgown' and 'table', per request for 'tangent'.
+
+    Returns:
+    dict: Engine name -> (coefficient, exponent).
+
+    """
+    if engines is None:
+        engines = BERNOULLI_ENGINES
+    model = {}
+    for name, engine in engines.items():
+        points = []
+        for max_index in max_indices:
+            if not engine.available(max_index):
+                break
+            timings = []
+            for _ in range(repeat + 1):
+                start_time = time.perf_counter()
+                engine.pairs([max_index])
+                timings.append(time.perf_counter() - start_time)
+            points.append((math.log(max_index), math.log(max(min(timings[1:]), 1e-9))))
+        if len(points) < 2:
+            continue
+        # Least-squares line through (ln max_index, ln seconds)
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        exponent = (sum((x - mean_x) * (y - mean_y) for x, y in points)
+                    / sum((x - mean_x) ** 2 for x, _ in points))
+        model[name] = (math.exp(mean_y - exponent * mean_x), exponent)
+    return model
+
+def calibrate_bernoulli_engines(max_indices=(100, 200, 400, 800)):
+    """
+    Re-runs the micro-benchmark on this machine and replaces the cost
+    models used by select_bernoulli_engine.
+    """
+    BERNOULLI_ENGINE_MODEL.update(benchmark_bernoulli_engines(max_indices))
+    return dict(BERNOULLI_ENGINE_MODEL)
+
+def select_bernoulli_engine(max_index, count, engines=None):
+    """
+    Picks the engine with the lowest estimated cost for a request of count
+    indices up to max_index.
+    """
+    if engines is None:
+        engines = BERNOULLI_ENGINES
+    candidates = [engine for name, engine in engines.items()
+                  if name in BERNOULLI_ENGINE_MODEL and engine.available(max_index)]
+    if not candidates:
+        raise ValueError("No Bernoulli engine is available for this request.")
+    return min(candidates, key=lambda engine: engine.estimate(max_index, count, BERNOULLI_ENGINE_MODEL))
+
+def bernoulli_fractions(indices, engine=None, deadline=None):
+    """
+    Returns the exact Bernoulli numbers B_n for the given indices as
+    Fractions, using the named engine or the one select_bernoulli_engine
+    picks for the request.
+
+    Raises:
+    DeadlineExceeded: If deadline expires before every number is computed.
+
+    """
+    indices = list(indices)
+    if not indices:
+        return []
+    if engine is None:
+        engine = select_bernoulli_engine(max(indices), len(indices))
+    elif isinstance(engine, str):
+        engine = BERNOULLI_ENGINES[engine]
+    return engine.fractions(indices, deadline)
+
+class ExactBernoulliTable:
+    """
+    Thread-safe, process-wide table of the exact even-index Bernoulli
+    numbers B_2, B_4, ... as Fractions, for the Decimal evaluation of the
+    series. BERNOULLI_TABLE only keeps BERNOULLI_RESULT_DIGITS significant
+    digits, which is not enough below about 1e-50; this table is extended
+    with bernoulli_fractions when a request needs more numbers than it holds,
+    so repeated requests only pay for the series loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fractions = []  # B_2k at position k - 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._fractions)
+
+    def even_fractions(self, count, deadline=None):
+        """
+        Returns the list [B_2, B_4, ..., B_2count] of exact Fractions.
+
+        Raises:
+        DeadlineExceeded: If deadline expires while extending the table;
+            the table is left as it was.
+
+        """
+        with self._lock:
+            known = len(self._fractions)
+            if count > known:
+                metrics = METRICS.enabled
+                stage_start = time.perf_counter() if metrics else None
+                self._fractions.extend(bernoulli_fractions(range(2 * known + 2, 2 * count + 1, 2), deadline=deadline))
+                if metrics:
+                    METRICS.add_time('bernoulli_generation', time.perf_counter() - stage_start)
+            return self._fractions[:count]
+
+    def clear(self):
+        """
+        Drops every cached Bernoulli number.
+        """
+        with self._lock:
+            self._fractions.clear()
+
+
+# Exact Bernoulli numbers shared by every Decimal evaluation and every thread
+EXACT_BERNOULLI_TABLE = ExactBernoulliTable()
+
+class AsymptoticLogEngine:
+    """
+    Float engine for the magnitude and sign of the Bernoulli numbers,
+    without computing them: for even n >= 2,
+        ln|B_n| = ln(2) + lgamma(n+1) - n*ln(2*pi) + ln(zeta(n)),
+    with sign (-1)^(n/2 + 1). zeta(n) comes from Borwein's algorithm with a
+    fixed number of terms, accurate to about 1e-16 for every n >= 2, so each
+    call costs a few dozen float operations at any index.
+    """
+
+    name = 'asymptotic'
+    BORWEIN_TERMS = 22  # Error below 3 / (3 + sqrt(8))^22 ~ 4e-17 relative
+
+    def __init__(self):
+        n = self.BORWEIN_TERMS
+        # d_k = n * sum_{i<=k} (n+i-1)! * 4^i / ((n-i)! * (2i)!), all integers
+        self._d = []
+        d_k = 0
+        for i in range(n + 1):
+            d_k += n * math.factorial(n + i - 1) * 4 ** i // (math.factorial(n - i) * math.factorial(2 * i))
+            self._d.append(float(d_k))
+
+    def ln_zeta(self, s):
+        """
+        Returns ln(zeta(s)) for s >= 2.
+        """
+        if s > 40:
+            # zeta(s) - 1 is below 1e-12 and the first terms give it to full precision
+            return math.log1p(2.0 ** -s + 3.0 ** -s + 5.0 ** -s + 4.0 ** -s)
+        n = self.BORWEIN_TERMS
+        d = self._d
+        total = 0.0
+        for k in range(n):
+            total += (-1) ** k * (d[k] - d[n]) / (k + 1) ** s
+        return math.log(-total / (d[n] * (1 - 2.0 ** (1 - s))))
+
+    def log_abs(self, n):
+        """
+        Returns (ln|B_n|, sign of B_n) for B_n != 0.
+
+        Raises:
+        ValueError: If n is negative or B_n is zero (odd n >= 3).
+
+        """
+        if n < 0:
+            raise ValueError("Bernoulli index must be non-negative.")
+        if n == 0:
+            return 0.0, 1
+        if n == 1:
+            return -math.log(2), -1
+        if n % 2 == 1:
+            raise ValueError("B_n is zero for odd n >= 3.")
+        ln_B_n = math.log(2) + math.lgamma(n + 1) - n * math.log(2 * math.pi) + self.ln_zeta(n)
+        return ln_B_n, (-1) ** (n // 2 + 1)
+
+    def series_coefficient(self, k):
+        """
+        Returns the coefficient c_k of LogCoefficientTable. Substituting
+        ln|B_2k| into c_k cancels the lgamma terms, leaving
+        c_k = ln(zeta(2k)) - 2k*ln(pi) - ln(k), and every sign_k is +1.
+        """
+        return self.ln_zeta(2 * k) - 2 * k * math.log(math.pi) - math.log(k)
+
+
+ASYMPTOTIC_LOG_ENGINE = AsymptoticLogEngine()
+
+class LogCoefficientTable:
+    """
+    Thread-safe table of the x-independent parts of the ln|sin(x)| series
+    and of its companion series for ln|cos(x)|.
+
+    The n-th series term is T_n = sign_n * exp(c_n + 2n * ln|x|) with
+    c_n = (2n-1)*ln(2) + ln|B_2n| - ln(n) - lgamma(2n+1) and
+    sign_n = (-1)^(n-1) * sign(B_2n), so that ln|sin(x)| = ln|x| - sum T_n.
+    Likewise ln|cos(x)| = -sum sign_n * exp(c_n + ln(2^(2n) - 1) + 2n * ln|x|).
+    Entry 0 of every list is unused. The table can be saved to and loaded
+    from a JSON file; the ln|cos(x)| coefficients are derived on load.
+
+    With source='asymptotic' (the default), c_n comes from
+    AsymptoticLogEngine in a few float operations; with source='exact',
+    from the Bernoulli numbers of bernoulli_table.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, bernoulli_table=None, source='asymptotic'):
+        if source not in ('asymptotic', 'exact'):
+            raise ValueError("source must be 'asymptotic' or 'exact'.")
+        self.source = source
+        self.bernoulli_table = bernoulli_table if bernoulli_table is not None else BERNOULLI_TABLE
+        self._lock = threading.Lock()
+        self.coefficients = [0.0]
+        self.cos_coefficients = [0.0]
+        self.signs = [0]
+
+    def __len__(self):
+        return len(self.coefficients) - 1
+
+    def ensure(self, n, series='sin', deadline=None):
+        """
+        Makes sure the coefficients c_1 ... c_n and their signs are available
+        and returns the (coefficients, signs) lists for the 'sin' or 'cos'
+        series. The lists only ever grow, so callers may keep indexing them
+        after the call.
+
+        Raises:
+        DeadlineExceeded: If deadline expires first; the coefficients computed
+            so far are kept.
+
+        """
+        if len(self.coefficients) <= n:
+            with self._lock:
+                metrics = METRICS.enabled
+                for k in range(len(self.coefficients), n + 1):
+                    if self.source == 'asymptotic':
+                        c_k = ASYMPTOTIC_LOG_ENGINE.series_coefficient(k)
+                        self.cos_coefficients.append(self._cos_coefficient(k, c_k))
+                        self.signs.append(1)
+                        self.coefficients.append(c_k)
+                        continue
+                    B_2k = self.bernoulli_table.get(2 * k, deadline)
+                    stage_start = time.perf_counter() if metrics else None
+                    ln_B_2k = decimal_log_abs(B_2k)
+                    if metrics:
+                        METRICS.add_time('decimal_to_float', time.perf_counter() - stage_start)
+                    c_k = (2 * k - 1) * math.log(2) + ln_B_2k - math.log(k) - math.lgamma(2 * k + 1)
+                    sign_B_2k = 1 if B_2k > 0 else -1
+                    # Readers check len(self.coefficients), so append to it last
+                    self.cos_coefficients.append(self._cos_coefficient(k, c_k))
+                    self.signs.append((-1) ** (k - 1) * sign_B_2k)
+                    self.coefficients.append(c_k)
+        if series == 'cos':
+            return self.cos_coefficients, self.signs
+        return self.coefficients, self.signs
+
+    @staticmethod
+    def _cos_coefficient(k, c_k):
+        # c_k + ln(2^(2k) - 1), without forming 2^(2k)
+        return c_k + 2 * k * math.log(2) + math.log1p(-4.0 ** -k)
+
+    def clear(self):
+        """
+        Drops every computed coefficient.
+        """
+        with self._lock:
+            self.coefficients = [0.0]
+            self.cos_coefficients = [0.0]
+            self.signs = [0]
+
+    def save(self, filename):
+        """
+        Saves the table to the specified JSON file.
+        """
+        with self._lock:
+            data = {
+                'version': self.FORMAT_VERSION,
+                'coefficients': self.coefficients[1:],
+                'signs': self.signs[1:],
+            }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def load(self, filename):
+        """
+        Replaces the table with the one stored in the specified JSON file.
+
+        Raises:
+        ValueError: If the file was written by an incompatible version.
+
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != self.FORMAT_VERSION:
+            raise ValueError("Unsupported log-coefficient table version.")
+        if len(data['coefficients']) != len(data['signs']):
+            raise ValueError("Corrupted log-coefficient table.")
+        with self._lock:
+            coefficients = [0.0] + [float(c) for c in data['coefficients']]
+            self.cos_coefficients = [0.0] + [self._cos_coefficient(k, coefficients[k]) for k in range(1, len(coefficients))]
+            self.signs = [0] + [int(sign) for sign in data['signs']]
+            self.coefficients = coefficients
+
+
+# Upper bound on the number of series terms compute_ln_sin_x will sum
+MAX_SERIES_TERMS = 10000
+
+# Series coefficients shared by every compute_ln_sin_x call and every thread
+LOG_COEFFICIENT_TABLE = LogCoefficientTable()
+
+def reduce_argument(x):
+    """
+    Reduces x modulo pi and folds it into (0; pi/2] using the symmetry of
+    the sine function; ln|sin(x)| is the same for the result.
+
+    Raises:
+    ValueError: If x is not finite, outside (-π;π) or a multiple of π.
+
+    """
+    if not math.isfinite(x):
+        raise ValueError("Function undefined for non-finite x.")
+    if x <= -math.pi or x >= math.pi:
+        raise ValueError("Function undefined for x outside the interval (-π;π).")
+
+    x_mod_pi = x % math.pi  # Reduce x modulo pi
+    if x_mod_pi == 0 or x_mod_pi == math.pi:
+        raise ValueError("Function undefined for x = k * pi")
+    if x_mod_pi > math.pi / 2:
+        x_mod_pi = math.pi - x_mod_pi  # Use symmetry of sine function
+    if x_mod_pi == 0:
+        raise ValueError("Function undefined for x = k * pi")
+    return x_mod_pi
+
+def predict_term_count(x_mod_pi, e, series='sin'):
+    """
+    Predicts the number of series terms compute_ln_sin_x needs for a reduced
+    argument 0 < x_mod_pi <= pi/2, without touching any Bernoulli number.
+
+    Since |B_2n| ~ 2 * (2n)! / (2*pi)^(2n), the n-th term has magnitude
+    |T_n| ~ (x/pi)^(2n) / n. The result is the last n before the first term
+    smaller than e, i.e. the m - 1 that solves 2m * ln(x/pi) - ln(m) = ln(e).
+    For the 'cos' series the terms carry an extra 2^(2n), so x/pi becomes
+    2x/pi. The prediction may be off by one or two; compute_ln_sin_x checks
+    it against the exact coefficients.
+    """
+    ln_x = decimal_log_abs(x_mod_pi) if isinstance(x_mod_pi, Decimal) else math.log(x_mod_pi)
+    ln_e = decimal_log_abs(e) if isinstance(e, Decimal) else math.log(e)
+    radius = math.pi / 2 if series == 'cos' else math.pi
+    ln_ratio = ln_x - math.log(radius)  # Negative inside the radius of convergence
+    m = max(ln_e / (2 * ln_ratio), 2.0)
+    for _ in range(3):  # Fixed-point refinement of 2m * ln_ratio - ln(m) = ln_e
+        m = max((ln_e + math.log(m)) / (2 * ln_ratio), 2.0)
+    return max(math.ceil(m) - 1, 1)
+
+class LnSinSeries:
+    """
+    Resumable evaluation of the ln|sin(x)| series for a single argument.
+
+    The object keeps the reduced argument, the term magnitudes and the
+    partial sums computed so far, so refining a result to a tighter e only
+    sums the terms that were not needed before, and a looser e is answered
+    from the stored partial sums. Terms are accumulated with Neumaier
+    compensated summation.
+    """
+
+    def __init__(self, x, reduction=False):
+        self.x = x
+        self.reduction = reduction
+        x_mod_pi = reduce_argument(x)
+        self.series = 'sin'
+        if reduction and x_mod_pi > math.pi / 3:
+            # ln|sin(x)| = ln|cos(pi/2 - x)|, and pi/2 - x < pi/6 converges faster
+            self.series = 'cos'
+            x_mod_pi = math.pi / 2 - x_mod_pi
+        self.argument = x_mod_pi  # The argument fed to the series
+        if self.series == 'cos':
+            self.offset = 0.0
+            self.two_ln_abs_argument = 2 * math.log(x_mod_pi) if x_mod_pi else None
+        else:
+            self.offset = math.log(abs(x_mod_pi))  # Compute ln|x_mod_pi|
+            self.two_ln_abs_argument = 2 * self.offset
+        self.ln_terms = [None]  # ln|T_n|; entry 0 is unused
+        self.partial_sums = [0.0]  # T_1 + ... + T_n
+        self._sum = 0.0  # Running Neumaier sum and its compensation
+        self._compensation = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def n(self):
+        """
+        The number of terms summed so far.
+        """
+        return len(self.partial_sums) - 1
+
+    def term_count(self, e, deadline=None):
+        """
+        Returns the number of terms needed for precision e: the last n before
+        the first term smaller than e.
+
+        Raises:
+        ValueError: If more than MAX_SERIES_TERMS terms would be needed.
+        DeadlineExceeded: If deadline expires while the coefficients are computed.
+
+        """
+        if self.two_ln_abs_argument is None:
+            return 0  # sin(pi/2) = 1, nothing to sum
+        ln_e = decimal_log_abs(e) if isinstance(e, Decimal) else math.log(e)  # Decimal e may be below the float range
+        two_ln_x = self.two_ln_abs_argument
+
+        # Decide the number of terms up front; impossible requests fail here
+        N = predict_term_count(self.argument, e, self.series)
+        if N > MAX_SERIES_TERMS:
+            raise ValueError("Cannot achieve desired precision with given x and e.")
+
+        # x-independent parts of the terms come from the process-wide table,
+        # fetched in one batch including the look-ahead term N + 1
+        coefficient_table = LOG_COEFFICIENT_TABLE
+        coefficients, signs = coefficient_table.ensure(N + 1, self.series, deadline)
+
+        # Verify the prediction against the exact stopping rule: N is the first
+        # index whose next term is smaller than e
+        while coefficients[N + 1] + (N + 1) * two_ln_x >= ln_e:
+            N += 1
+            if N > MAX_SERIES_TERMS:
+                raise ValueError("Cannot achieve desired precision with given x and e.")
+            coefficients, signs = coefficient_table.ensure(N + 1, self.series, deadline)
+        while N > 1 and coefficients[N] + N * two_ln_x < ln_e:
+            N -= 1
+        return N
+
+    def refine(self, e, deadline=None):
+        """
+        Returns (f_x_e, N) for precision e, summing only the terms beyond
+        those already computed.
+
+        If deadline (a Deadline or a number of seconds) expires first, the
+        terms summed so far are kept for the next call and a PartialResult
+        with the best value so far and its error bound is returned.
+
+        Raises:
+        ValueError: If e is not in (0;1) or cannot be achieved.
+
+        """
+        # Validate input e
+        if not (0 < e < 1):
+            raise ValueError("Precision e must be in the interval (0;1).")
+        deadline = Deadline.from_value(deadline)
+        with self._lock:
+            try:
+                stage_start = time.perf_counter() if METRICS.enabled else None
+                N = self.term_count(e, deadline)
+                if stage_start is not None:
+                    METRICS.add_time('term_count', time.perf_counter() - stage_start)
+                if N > self.n:
+                    self._extend(N, deadline)
+            except DeadlineExceeded:
+                n = self.n
+                return PartialResult(self.offset - self.partial_sums[n], n, self.tail_bound(n))
+            return self.offset - self.partial_sums[N], N
+
+    def tail_bound(self, n):
+        """
+        Returns an upper bound on the terms beyond T_n.
+
+        T_k = zeta(2k) * q^k / k with q = (x/pi)^2 (times 1 - 4^-k for the
+        'cos' series, with q = (2x/pi)^2), so consecutive terms shrink by at
+        least q and the tail is at most zeta(2) * q^(n+1) / ((n+1) * (1 - q)).
+        """
+        if self.two_ln_abs_argument is None:
+            return 0.0
+        radius = math.pi / 2 if self.series == 'cos' else math.pi
+        q = (self.argument / radius) ** 2
+        return math.pi ** 2 / 6 * q ** (n + 1) / ((n + 1) * (1 - q))
+
+    def _extend(self, N, deadline=None):
+        coefficients, signs = LOG_COEFFICIENT_TABLE.ensure(N, self.series)
+        two_ln_x = self.two_ln_abs_argument
+        ln_min_float = math.log(sys.float_info.min)
+        sum_terms = self._sum
+        compensation = self._compensation
+        first = self.n + 1
+        metrics = METRICS.enabled
+        stage_start = time.perf_counter() if metrics else None
+        underflowed = 0
+        try:
+            for n in range(first, N + 1):
+                if deadline is not None and (n - first) % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                    raise DeadlineExceeded("Deadline expired while summing the series.")
+
+                # ln(|T_n|) = c_n + 2n * ln|x|
+                ln_T_n = coefficients[n] + n * two_ln_x
+
+                # Avoid underflow
+                if ln_T_n < ln_min_float:
+                    T_n = 0.0
+                    underflowed += 1
+                else:
+                    T_n = signs[n] * math.exp(ln_T_n)
+
+                # Add term to sum, keeping the rounding error (Neumaier summation)
+                total = sum_terms + T_n
+                if abs(sum_terms) >= abs(T_n):
+                    compensation += (sum_terms - total) + T_n
+                else:
+                    compensation += (T_n - total) + sum_terms
+                sum_terms = total
+                self._sum = sum_terms
+                self._compensation = compensation
+                self.ln_terms.append(ln_T_n)
+                self.partial_sums.append(sum_terms + compensation)
+        finally:
+            if metrics:
+                METRICS.add_time('term_loop', time.perf_counter() - stage_start)
+                METRICS.count('terms_evaluated', self.n - first + 1)
+                METRICS.count('terms_underflowed', underflowed)
 
-def compute_ln_sin_x(x, e):
+def compute_ln_sin_x(x, e, reduction=False, precision='float', digits=None, deadline=None, fast=False):
     """
     Computes f(x) = ln|sin(x)| using the Maclaurin series expansion.
 
     Parameters:
     x (float): The function argument.
     e (float): The desired precision (0 < e < 1).
+    reduction (bool): If True, arguments above pi/3 are evaluated as
+        ln|cos(pi/2 - x)| with the companion ln|cos| series, which keeps the
+        series ratio at most 1/9 instead of 1/4 near pi/2.
+    precision (str): 'float' for double precision, or 'decimal' to evaluate
+        the whole series in Decimal (see compute_ln_sin_x_decimal).
+    digits (int): Number of significant digits of a Decimal result; implies
+        precision='decimal'.
+    deadline (Deadline or float): Time budget in seconds, or a Deadline that
+        can also be cancelled from another thread. None means no limit.
+    fast (bool): If True and the Chebyshev approximation guarantees an
+        error of at most e, evaluate it instead of the series; N is then
+        the number of polynomial terms. Tighter e falls back to the series.
 
     Returns:
     tuple: A tuple containing:
-        - f_x_e (float): The computed value of the function.
+        - f_x_e (float or Decimal): The computed value of the function.
         - N (int): The number of terms used in the series expansion.
+    If the deadline expires first, a PartialResult with the best value so
+    far and its error_bound is returned instead.
 
     Raises:
     ValueError: If the function cannot be computed for the given x and e.
-    TimeoutError: If the computation cannot achieve desired precision within 15 minutes.
 
     """
+    if digits is not None or precision == 'decimal':
+        return compute_ln_sin_x_decimal(x, e, reduction, digits, deadline)
+    if precision != 'float':
+        raise ValueError("precision must be 'float' or 'decimal'.")
+
     # Validate input e
     if not (0 < e < 1):
         raise ValueError("Precision e must be in the interval (0;1).")
 
-    if x <= -math.pi or x >= math.pi:
-        raise ValueError("Function undefined for x outside the interval (-π;π).")
+    if fast:
+        x_mod_pi = reduce_argument(x)
+        n = CHEBYSHEV_APPROXIMATION.term_count(e, x_mod_pi)
+        if n is not None:
+            return CHEBYSHEV_APPROXIMATION.evaluate(x_mod_pi, n), n
 
-    x_mod_pi = x % math.pi  # Reduce x modulo pi
-    if x_mod_pi == 0 or x_mod_pi == math.pi:
-        raise ValueError("Function undefined for x = k * pi")
-    if x_mod_pi > math.pi / 2:
-        x_mod_pi = math.pi - x_mod_pi  # Use symmetry of sine function
-    if x_mod_pi == 0:
-        raise ValueError("Function undefined for x = k * pi")
+    return LnSinSeries(x, reduction).refine(e, deadline)
 
-    ln_x_mod_pi = math.log(abs(x_mod_pi))  # Compute ln|x_mod_pi|
-    sum_terms = 0.0  # Initialize sum of terms
-    N = 0  # Term counter
-    n = 1
-    max_n = 10000  # Increase limit to allow more terms
+# Guard digits used by the Decimal evaluation of the series
+DECIMAL_GUARD_DIGITS = 10
+
+def compute_ln_sin_x_decimal(x, e, reduction=False, digits=None, deadline=None):
+    """
+    Computes f(x) = ln|sin(x)| with the whole term loop and the logarithm
+    evaluated in a local Decimal context, using the exact Bernoulli numbers
+    of EXACT_BERNOULLI_TABLE.
 
-    # Initialize the Bernoulli numbers generator
-    bernoulli_gen = compute_bernoulli_numbers_generator()
+    Parameters:
+    x (float or Decimal): The function argument.
+    e (float or Decimal): The desired precision (0 < e < 1); may be far
+        below what a float can resolve.
+    reduction (bool): Same as for compute_ln_sin_x.
+    digits (int): Number of significant digits of the result; by default
+        derived from e and the magnitude of the result.
+    deadline (Deadline or float): Same as for compute_ln_sin_x; checked
+        between terms.
+
+    Returns:
+    tuple: A tuple containing:
+        - f_x_e (Decimal): The computed value of the function.
+        - N (int): The number of terms used in the series expansion.
+    If the deadline expires first, a PartialResult is returned instead.
 
-    # Skip B_0 since the series starts from B_2
-    next(bernoulli_gen)  # B_0
-    B_cache = [0.0]  # Cache for Bernoulli numbers
+    Raises:
+    ValueError: If the function cannot be computed for the given x and e.
 
-    start_time = time.time()
-    ln_2 = math.log(2)
-    ln_abs_x_mod_pi = math.log(abs(x_mod_pi))
-    ln_e = math.log(e)
-    ln_min_float = math.log(sys.float_info.min)
-    while n <= max_n:
-        # Check computation time
-        if time.time() - start_time > 15 * 60:  # 15 minutes limit
-            raise TimeoutError("Cannot achieve desired precision within 15 minutes.")
+    """
+    # Validate input e
+    if not (0 < e < 1):
+        raise ValueError("Precision e must be in the interval (0;1).")
+    if digits is not None and digits < 1:
+        raise ValueError("digits must be a positive integer.")
+    if not isinstance(x, Decimal):
+        reduce_argument(x)  # Same domain checks as the float path
+    elif not x.is_finite():
+        raise ValueError("Function undefined for non-finite x.")
+    deadline = Deadline.from_value(deadline)
+    x = Decimal(x)
+    e = Decimal(e)
 
-        # Ensure Bernoulli numbers are available up to 2n
-        B_n_index = 2 * n
-        while len(B_cache) <= B_n_index:
-            B_n = next(bernoulli_gen)
-            B_cache.append(B_n)
+    with localcontext() as ctx:
+        # Enough digits to resolve e next to a result of magnitude up to ~|ln x|
+        ln_magnitude = max(abs(decimal_log_abs(x)), 1.0) if x else 1.0
+        needed_digits = -e.adjusted() + len(str(int(ln_magnitude))) + 1
+        ctx.prec = max(needed_digits, digits or 0) + DECIMAL_GUARD_DIGITS
+        pi = compute_pi(ctx.prec)
+        if x <= -pi or x >= pi:
+            raise ValueError("Function undefined for x outside the interval (-π;π).")
+        x = abs(x)  # |sin(x)| is even
+        if x > pi / 2:
+            x = pi - x  # Use symmetry of sine function
+        if x == 0:
+            raise ValueError("Function undefined for x = k * pi")
+        series = 'sin'
+        if reduction and x > pi / 3:
+            # ln|sin(x)| = ln|cos(pi/2 - x)|
+            series = 'cos'
+            x = pi / 2 - x
+            if x == 0:
+                return Decimal(0), 0  # sin(pi/2) = 1
 
-        B_2n = B_cache[B_n_index]
+        # Fetch exact B_2 ... B_2(N+2) in one batch from the shared table, N
+        # from the prediction
+        fractions = []
 
-        if B_2n == 0:
-            n += 1
-            continue
+        def bernoulli_2n(n):
+            if n > len(fractions):
+                count = max(n, predict_term_count(x, e, series) + 2, 2 * len(fractions))
+                fractions[:] = EXACT_BERNOULLI_TABLE.even_fractions(count, deadline)
+            B_2n = fractions[n - 1]
+            return Decimal(B_2n.numerator) / Decimal(B_2n.denominator)
 
-        # Compute ln(|T_n|)
-        ln_T_n = (2 * n - 1) * ln_2 + math.log(abs(B_2n)) + 2 * n * ln_abs_x_mod_pi - math.log(n) - math.lgamma(2 * n +1)
+        def terms():
+            # T_n = (-1)^(n-1) * 2^(2n-1) * B_2n * x^(2n) / (n * (2n)!), times
+            # (2^(2n) - 1) for the ln|cos| series
+            x_squared = x * x
+            x_power = Decimal(1)
+            factorial = Decimal(1)
+            two_power = Decimal('0.5')
+            n = 0
+            while True:
+                n += 1
+                x_power *= x_squared
+                factorial *= (2 * n - 1) * (2 * n)
+                two_power *= 4
+                T_n = (-1) ** (n - 1) * two_power * bernoulli_2n(n) * x_power / (n * factorial)
+                if series == 'cos':
+                    T_n *= 2 * two_power - 1
+                yield T_n
 
-        # Compute T_n = sign_T_n * exp(ln_T_n)
-        sign_B_2n = 1 if B_2n > 0 else -1
-        sign_T_n = (-1) ** (n - 1) * sign_B_2n
+        sum_terms = Decimal(0)
+        N = 0
+        term_iterator = terms()
+        partial = False
+        try:
+            # The first term fetches the Bernoulli numbers, which checks the deadline
+            T_n = next(term_iterator)
+            while True:
+                if deadline is not None and N % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                    partial = True
+                    break
+                sum_terms += T_n
+                N += 1
+                T_n = next(term_iterator)
+                # Stop when the next term is smaller than e
+                if abs(T_n) < e:
+                    break
+                if N >= MAX_SERIES_TERMS:
+                    raise ValueError("Cannot achieve desired precision with given x and e.")
+        except DeadlineExceeded:
+            partial = True  # sum_terms holds the first N terms
 
-        # Avoid underflow
-        if ln_T_n < ln_min_float:
-            T_n = 0.0
+        if series == 'cos':
+            f_x_e = -sum_terms
+        else:
+            f_x_e = x.ln() - sum_terms
+        if digits is not None:
+            ctx.prec = digits
         else:
-            T_n = sign_T_n * math.exp(ln_T_n)
+            ctx.prec = max(needed_digits, 1)
+        if partial:
+            # T_k = zeta(2k) * q^k / k, see LnSinSeries.tail_bound
+            radius = math.pi / 2 if series == 'cos' else math.pi
+            q = (float(x) / radius) ** 2
+            return PartialResult(+f_x_e, N, math.pi ** 2 / 6 * q ** (N + 1) / ((N + 1) * (1 - q)))
+        return +f_x_e, N
+
+class ChebyshevApproximation:
+    """
+    Chebyshev expansion of g(t) = ln(sin(x)/x) in t = x^2 over [0, pi^2/4],
+    so that ln|sin(x)| = ln(x) + g(x^2) for a reduced argument 0 < x <= pi/2.
+
+    The nearest singularity of g is at t = pi^2 (x = pi), which lies at
+    u = 7 in the Chebyshev variable u = 8t/pi^2 - 1, so the coefficients
+    decay like (7 + sqrt(48))^-k, about 14^-k. The coefficients are computed
+    once, on first use, from compute_ln_sin_x_decimal at count Chebyshev
+    nodes. error_bound(n) is the sum of the dropped coefficients plus an
+    allowance for rounding the stored coefficients and the Clenshaw
+    recurrence in double precision; error_bound(n, x_mod_pi) also covers
+    rounding ln(x) and adding it to g, which grows with |ln(x)|.
+    """
+
+    def __init__(self, count=32, digits=40):
+        self.count = count
+        self.digits = digits
+        self._lock = threading.Lock()
+        self._coefficients = None  # c_0 ... c_(count-1), with c_0 halved
+        self._error_bounds = None  # Bound on |g - first n terms| for n = 0 ... count
+        self._magnitude = None  # sum |c_k|, a bound on |g| and on every partial sum
+
+    def coefficients(self):
+        """
+        Returns the Chebyshev coefficients as floats, computing them if needed.
+        """
+        if self._coefficients is None:
+            with self._lock:
+                if self._coefficients is None:
+                    self._build()
+        return self._coefficients
+
+    def _build(self):
+        count = self.count
+        with localcontext() as ctx:
+            ctx.prec = self.digits + DECIMAL_GUARD_DIGITS
+            pi = compute_pi(ctx.prec)
+            e = Decimal(10) ** -(self.digits + 5)
+            sums = [Decimal(0)] * count
+            for j in range(count):
+                # Node u_j = cos((2j + 1) * pi / (2 * count)), and t = (u + 1) * pi^2 / 8
+                u = decimal_cos((2 * j + 1) * pi / (2 * count))
+                x = ((u + 1) * pi * pi / 8).sqrt()
+                g = compute_ln_sin_x_decimal(x, e, True, self.digits + 5)[0] - x.ln()
+                T_previous, T_k = Decimal(1), u  # T_0(u), T_1(u)
+                sums[0] += g
+                for k in range(1, count):
+                    sums[k] += g * T_k
+                    T_previous, T_k = T_k, 2 * u * T_k - T_previous
+            exact = [total * 2 / count for total in sums]
+            exact[0] /= 2
+            # Coefficients beyond count shrink by at least 13 per index; the
+            # same amount again covers their aliasing into the computed ones
+            tail = abs(exact[-1]) / 6
+            error_bounds = [0.0] * (count + 1)
+            for n in range(count, -1, -1):
+                error_bounds[n] = float(tail)
+                if n:
+                    tail += abs(exact[n - 1])
+        coefficients = [float(c) for c in exact]
+        # Rounding the coefficients to float and the Clenshaw recurrence each
+        # cost a few units in the last place of sum |c_k|
+        rounding = 4 * sys.float_info.epsilon * sum(abs(c) for c in coefficients)
+        self._error_bounds = [bound + rounding for bound in error_bounds]
+        self._magnitude = sum(abs(c) for c in coefficients)
+        self._coefficients = coefficients
+
+    def error_bound(self, n, x_mod_pi=None):
+        """
+        Returns a bound on the error of g evaluated with the first n terms
+        or, given a reduced argument x_mod_pi, on the error of evaluate.
+        """
+        self.coefficients()
+        if x_mod_pi is None:
+            return self._error_bounds[n]
+        # math.log(x_mod_pi) and the two final additions are each rounded
+        # to within half an ulp of a value below |ln(x)| + sum |c_k|
+        return self._error_bounds[n] + 2 * sys.float_info.epsilon * (abs(math.log(x_mod_pi)) + self._magnitude)
+
+    def term_count(self, e, x_mod_pi=None):
+        """
+        Returns the smallest number of terms whose error bound (for x_mod_pi
+        if given, see error_bound) is at most e, or None if e is tighter
+        than the full expansion can guarantee.
+        """
+        self.coefficients()
+        for n in range(1, self.count + 1):
+            if self.error_bound(n, x_mod_pi) <= e:
+                return n
+        return None
+
+    def evaluate(self, x_mod_pi, n):
+        """
+        Returns ln|sin(x)| for a reduced argument 0 < x_mod_pi <= pi/2 from
+        the first n terms, with the Clenshaw recurrence.
+        """
+        coefficients = self.coefficients()
+        u = 8 * x_mod_pi * x_mod_pi / (math.pi * math.pi) - 1
+        b_next, b_next_next = 0.0, 0.0
+        for k in range(n - 1, 0, -1):
+            b_next, b_next_next = 2 * u * b_next - b_next_next + coefficients[k], b_next
+        return math.log(x_mod_pi) + coefficients[0] + u * b_next - b_next_next
+
+
+# Polynomial fast path used by compute_ln_sin_x(..., fast=True)
+CHEBYSHEV_APPROXIMATION = ChebyshevApproximation()
+
+class LnSinSeriesCache:
+    """
+    Thread-safe LRU cache of LnSinSeries objects keyed by x, so repeated and
+    refined requests for the same argument only pay for additional terms.
+    """
+
+    def __init__(self, maxsize=256):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._series = OrderedDict()  # (x, reduction) -> LnSinSeries, in LRU order
+
+    def __len__(self):
+        with self._lock:
+            return len(self._series)
 
-        sum_terms += T_n  # Add term to sum
-        N = n  # Update term counter
+    def get(self, x, reduction=False):
+        """
+        Returns the cached series for x, creating it if needed.
+        """
+        key = (x, reduction)
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                if METRICS.enabled:
+                    METRICS.count('series_cache_hits')
+                self._series.move_to_end(key)
+                return series
+        if METRICS.enabled:
+            METRICS.count('series_cache_misses')
+        series = LnSinSeries(x, reduction)  # Validates x outside the lock
+        with self._lock:
+            series = self._series.setdefault(key, series)
+            self._series.move_to_end(key)
+            self._evict()
+        return series
+
+    def compute(self, x, e, reduction=False, deadline=None):
+        """
+        Same contract as compute_ln_sin_x, reusing previously summed terms;
+        a series interrupted by its deadline resumes where it stopped.
+        """
+        # Validate input e before creating a series for x
+        if not (0 < e < 1):
+            raise ValueError("Precision e must be in the interval (0;1).")
+        return self.get(x, reduction).refine(e, deadline)
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of cached series, evicting the least
+        recently used ones if needed.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Drops every cached series.
+        """
+        with self._lock:
+            self._series.clear()
+
+    def _evict(self):
+        while len(self._series) > self.maxsize:
+            self._series.popitem(last=False)
+
+
+# Series state shared by main() and batch workloads
+SERIES_CACHE = LnSinSeriesCache()
+
+def compute_ln_sin_x_batch(xs, e):
+    """
+    Computes f(x) = ln|sin(x)| for a whole array of arguments at once, using
+    the same series, reduction and stopping rule as compute_ln_sin_x.
+
+    Parameters:
+    xs (array_like): The function arguments.
+    e (float or array_like): The desired precision, a scalar or one value per
+        argument (0 < e < 1).
+
+    Returns:
+    tuple: A tuple containing:
+        - f_x_e (numpy.ndarray): The computed values, NaN where invalid.
+        - N (numpy.ndarray): The number of terms used, 0 where invalid.
+        - errors (numpy.ndarray): A boolean mask of the elements that could not
+          be computed (invalid x or e, or precision not achievable).
+
+    Raises:
+    ImportError: If NumPy is not installed.
+    ValueError: If e cannot be broadcast to the shape of xs.
+
+    """
+    if np is None:
+        raise ImportError("compute_ln_sin_x_batch requires NumPy.")
+    xs = np.asarray(xs, dtype=float)
+    shape = xs.shape
+    x = xs.ravel()
+    e_values = np.broadcast_to(np.asarray(e, dtype=float), shape).ravel()
+
+    # Same validation, reduction modulo pi and symmetry fold as compute_ln_sin_x
+    with np.errstate(invalid='ignore'):
+        valid = (0 < e_values) & (e_values < 1) & (x > -math.pi) & (x < math.pi)
+        x_mod_pi = np.mod(x, math.pi)
+        x_mod_pi = np.where(x_mod_pi > math.pi / 2, math.pi - x_mod_pi, x_mod_pi)
+        valid &= (x_mod_pi != 0) & np.isfinite(x_mod_pi)
+
+    ln_x_mod_pi = np.zeros_like(x)
+    ln_x_mod_pi[valid] = np.log(x_mod_pi[valid])
+    two_ln_abs_x_mod_pi = 2 * ln_x_mod_pi
+    ln_e = np.zeros_like(x)
+    ln_e[valid] = np.log(e_values[valid])
+    ln_min_float = math.log(sys.float_info.min)
+
+    sum_terms = np.zeros_like(x)
+    N = np.zeros(x.shape, dtype=np.int64)
+    active = np.flatnonzero(valid)  # Indices of elements still summing terms
+    coefficient_table = LOG_COEFFICIENT_TABLE
+    coefficients, signs = coefficient_table.ensure(16)
+    n = 1
+    while active.size and n <= MAX_SERIES_TERMS:
+        if len(coefficients) <= n + 1:
+            coefficients, signs = coefficient_table.ensure(n + n // 2 + 8)
+
+        two_ln_x = two_ln_abs_x_mod_pi[active]
+        ln_T_n = coefficients[n] + n * two_ln_x
+        T_n = np.where(ln_T_n < ln_min_float, 0.0, signs[n] * np.exp(ln_T_n))
+        sum_terms[active] += T_n
+        N[active] = n
         n += 1
 
-        # Check if next term is smaller than e
-        B_n_index = 2 * n
-        while len(B_cache) <= B_n_index:
-            B_n = next(bernoulli_gen)
-            B_cache.append(B_n)
+        # Drop the elements whose next term is smaller than their e
+        converged = coefficients[n] + n * two_ln_x < ln_e[active]
+        active = active[~converged]
 
-        B_2n_next = B_cache[B_n_index]
-        if B_2n_next == 0:
-            continue
+    errors = ~valid
+    errors[active] = True  # Precision not achieved within MAX_SERIES_TERMS terms
+    f_x_e = np.where(errors, np.nan, ln_x_mod_pi - sum_terms)
+    N[errors] = 0
+    return f_x_e.reshape(shape), N.reshape(shape), errors.reshape(shape)
 
-        ln_T_n_plus1 = (2 * n - 1) * ln_2 + math.log(abs(B_2n_next)) + 2 * n * ln_abs_x_mod_pi - math.log(
-            n) - math.lgamma(2 * n + 1)
 
-        if ln_T_n_plus1 < ln_e:
-            break
-    else:
-        raise ValueError("Cannot achieve desired precision with given x and e.")
+# Suffix of the sidecar file that keeps the entry count of a results file
+RESULTS_INDEX_SUFFIX = '.idx'
+
+def format_result_line(result, date_str):
+    """
+    Formats one result dictionary as a line of the results file.
+    """
+    x = result['x']
+    e = result['e']
+    f_x_e = result['f_x_e']
+    N = result['N']
+    return f"{date_str}, {x}, {e}, {f_x_e:.12f}, {N}\n"
 
-    f_x_e = ln_x_mod_pi - sum_terms
-    return f_x_e, N
+def read_results_index(filename):
+    """
+    Returns the sidecar index of a results file as a dictionary with the
+    'entries' count and the byte 'size' of the file it describes, or None
+    if the index is missing or unreadable.
+    """
+    try:
+        with open(filename + RESULTS_INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return {'entries': int(index['entries']), 'size': int(index['size'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
+def write_results_index(filename, entries, size):
+    """
+    Atomically replaces the sidecar index of a results file.
+    """
+    index_name = filename + RESULTS_INDEX_SUFFIX
+    tmp_name = index_name + '.tmp'
+    with open(tmp_name, 'w', encoding='utf-8') as f:
+        json.dump({'entries': entries, 'size': size}, f)
+    os.replace(tmp_name, index_name)
 
-def save_results_to_file(filename, session_results):
+def save_results_to_file(filename, session_results, fsync=False):
     """
     Saves the session results to the specified file.
 
+    The results are written with a single buffered write. The total entry
+    count is kept in a sidecar index (filename + RESULTS_INDEX_SUFFIX) next
+    to the byte size of the file it describes, so it is only recounted when
+    the index is missing or the file was changed behind its back.
+
     Parameters:
     filename (str): The name of the file to save results.
     session_results (list): A list of dictionaries containing the session results.
+    fsync (bool): If True, the data is forced to disk before returning.
 
     Returns:
     int: The total number of entries in the file after saving.
@@ -193,146 +1984,866 @@ def save_results_to_file(filename, session_results):
 
     """
     date_str = datetime.datetime.now().strftime("%d.%m.%Y")
+    data = ''.join(format_result_line(result, date_str) for result in session_results).encode('utf-8')
     try:
-        with open(filename, 'a', encoding='utf-8') as f:
-            for result in session_results:
-                x = result['x']
-                e = result['e']
-                f_x_e = result['f_x_e']
-                N = result['N']
-                f.write(f"{date_str}, {x}, {e}, {f_x_e:.12f}, {N}\n")
+        with open(filename, 'ab') as f:
+            offset = f.tell()  # Size of the file before this save
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
     except Exception as ex:
         print("An error occurred while writing to the file:", ex)
         return None
     # Count total number of entries in the file
+    index = read_results_index(filename)
+    if offset == 0:
+        total_entries = len(session_results)
+    elif index is not None and index['size'] == offset:
+        total_entries = index['entries'] + len(session_results)
+    else:
+        # Missing or stale index: count the entries once
+        try:
+            with open(filename, 'rb') as f:
+                total_entries = sum(1 for line in f)
+        except Exception as ex:
+            print("An error occurred while reading the file:", ex)
+            return None
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            total_entries = sum(1 for line in f)
-    except Exception as ex:
-        print("An error occurred while reading the file:", ex)
+        write_results_index(filename, total_entries, offset + len(data))
+    except OSError:
+        pass  # The next save recounts the file
+    return total_entries
+
+# Suffix of the binary results store kept next to a text results file
+RESULTS_STORE_SUFFIX = '.rbin'
+
+class ResultsStore:
+    """
+    Read-only, memory-mapped view of an append-only binary results store
+    written by save_results_to_store, with sorted indices on x and on date.
+
+    File layout (all numbers little-endian):
+        header:  magic b'LNSR', version (u16), record size (u16)
+        records: date as a proleptic Gregorian ordinal (u32), x, e and
+                 f_x_e (f64), N (u32)
+    A trailing partial record (an interrupted append) is ignored.
+
+    Each index is a sidecar file (filename + INDEX_SUFFIXES[key]) holding
+    the record numbers sorted by that key:
+        header:  magic b'LNSI', version (u16), reserved (u16), number of
+                 records covered (u32)
+        body:    record numbers (u32)
+    An index that does not cover every record is rebuilt in memory.
+    """
+
+    MAGIC = b'LNSR'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHH')
+    RECORD = struct.Struct('<IdddI')
+    INDEX_MAGIC = b'LNSI'
+    INDEX_HEADER = struct.Struct('<4sHHI')
+    INDEX_SUFFIXES = {'x': '.xidx', 'date': '.didx'}
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.check_header(self._mmap)
+        except Exception:
+            self._mmap.close()
+            raise
+        self.count = (len(self._mmap) - self.HEADER.size) // self.RECORD.size
+        self._indices = {}
+
+    @classmethod
+    def check_header(cls, data):
+        """
+        Checks the header at the start of data (bytes or a buffer).
+
+        Raises:
+        ValueError: If data does not start with the header of a supported
+            results store.
+
+        """
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Results store file is truncated.")
+        magic, version, record_size = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a results store file.")
+        if version != cls.VERSION or record_size != cls.RECORD.size:
+            raise ValueError("Unsupported results store version.")
+
+    def __len__(self):
+        return self.count
+
+    def key(self, i, key):
+        """
+        Returns the x or the date ordinal of record i.
+        """
+        offset = self.HEADER.size + i * self.RECORD.size
+        if key == 'x':
+            return struct.unpack_from('<d', self._mmap, offset + 4)[0]
+        return struct.unpack_from('<I', self._mmap, offset)[0]
+
+    def keys(self, key, start=0):
+        """
+        Returns the x values or the date ordinals of records start onwards,
+        unpacked in a single pass over the file.
+        """
+        field = 1 if key == 'x' else 0
+        begin = self.HEADER.size + start * self.RECORD.size
+        end = self.HEADER.size + self.count * self.RECORD.size
+        with memoryview(self._mmap)[begin:end] as view:
+            return [record[field] for record in self.RECORD.iter_unpack(view)]
+
+    def record(self, i):
+        """
+        Returns record i as a result dictionary with an extra 'date' (datetime.date).
+
+        Raises:
+        IndexError: If record i is not stored in the file.
+
+        """
+        if not 0 <= i < self.count:
+            raise IndexError("Record not stored in the results store.")
+        date, x, e, f_x_e, N = self.RECORD.unpack_from(self._mmap, self.HEADER.size + i * self.RECORD.size)
+        return {'date': datetime.date.fromordinal(date), 'x': x, 'e': e, 'f_x_e': f_x_e, 'N': N}
+
+    def index(self, key):
+        """
+        Returns the record numbers sorted by key ('x' or 'date'), read from
+        the index file if it is up to date and rebuilt otherwise.
+        """
+        order = self._indices.get(key)
+        if order is None:
+            order = read_results_store_index(self.filename, key, self.count)
+            if order is None:
+                order = sorted(range(self.count), key=self.keys(key).__getitem__)
+            self._indices[key] = order
+        return order
+
+    def query(self, x_min=None, x_max=None, date_min=None, date_max=None, max_e=None):
+        """
+        Generator that yields the records with x_min <= x <= x_max,
+        date_min <= date <= date_max and e <= max_e (each bound optional),
+        walking the x index, else the date index, else the whole file.
+        """
+        date_min = date_min.toordinal() if date_min is not None else None
+        date_max = date_max.toordinal() if date_max is not None else None
+        if x_min is not None or x_max is not None:
+            candidates = self._range('x', x_min, x_max)
+        elif date_min is not None or date_max is not None:
+            candidates = self._range('date', date_min, date_max)
+        else:
+            candidates = range(self.count)
+        for i in candidates:
+            date, x, e, f_x_e, N = self.RECORD.unpack_from(self._mmap, self.HEADER.size + i * self.RECORD.size)
+            if (x_min is not None and x < x_min) or (x_max is not None and x > x_max):
+                continue
+            if (date_min is not None and date < date_min) or (date_max is not None and date > date_max):
+                continue
+            if max_e is not None and e > max_e:
+                continue
+            yield {'date': datetime.date.fromordinal(date), 'x': x, 'e': e, 'f_x_e': f_x_e, 'N': N}
+
+    def _range(self, key, low, high):
+        # Binary search for the first record with key >= low, then walk
+        # the index until the key exceeds high
+        order = self.index(key)
+        start, end = 0, len(order)
+        if low is not None:
+            while start < end:
+                middle = (start + end) // 2
+                if self.key(order[middle], key) < low:
+                    start = middle + 1
+                else:
+                    end = middle
+        for position in range(start, len(order)):
+            i = order[position]
+            if high is not None and self.key(i, key) > high:
+                break
+            yield i
+
+    def close(self):
+        for order in self._indices.values():
+            if isinstance(order, memoryview):
+                order.release()
+        self._indices.clear()
+        self._mmap.close()
+
+def read_results_store_index(filename, key, count):
+    """
+    Returns the record numbers stored in the index of a results store for
+    key, or None if the index is missing, unreadable or does not cover
+    exactly count records.
+    """
+    try:
+        with open(filename + ResultsStore.INDEX_SUFFIXES[key], 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = ResultsStore.INDEX_HEADER
+    if len(data) != header.size + 4 * count:
+        return None
+    magic, version, _, covered = header.unpack_from(data, 0)
+    if magic != ResultsStore.INDEX_MAGIC or version != ResultsStore.VERSION or covered != count:
         return None
+    if sys.byteorder == 'big':
+        # The index is little-endian, so a native cast would misread it
+        return list(struct.unpack_from(f'<{count}I', data, header.size))
+    return memoryview(data)[header.size:].cast('I')
+
+def write_results_store_index(filename, key, count, body):
+    """
+    Atomically replaces the index of a results store for key with body,
+    the packed record numbers (u32, little-endian) of count records.
+    """
+    index_name = filename + ResultsStore.INDEX_SUFFIXES[key]
+    tmp_name = index_name + '.tmp'
+    with open(tmp_name, 'wb') as f:
+        f.write(ResultsStore.INDEX_HEADER.pack(ResultsStore.INDEX_MAGIC, ResultsStore.VERSION, 0, count))
+        f.write(body)
+    os.replace(tmp_name, index_name)
+
+def merge_results_store_index(store, key, old_order, new_order):
+    """
+    Returns the packed index body for key after merging new_order, the
+    record numbers appended to store sorted by key, into old_order, the
+    existing index. Only the new records are placed by binary search; the
+    runs of the existing index between them are copied as bytes.
+    """
+    old_body = old_order.tobytes() if isinstance(old_order, memoryview) else struct.pack(f'<{len(old_order)}I', *old_order)
+    chunks = []
+    start = 0
+    for i in new_order:
+        value = store.key(i, key)
+        # First position whose key is greater, so equal keys keep record order
+        low, high = start, len(old_order)
+        while low < high:
+            middle = (low + high) // 2
+            if value < store.key(old_order[middle], key):
+                high = middle
+            else:
+                low = middle + 1
+        chunks.append(old_body[4 * start:4 * low])
+        chunks.append(struct.pack('<I', i))
+        start = low
+    chunks.append(old_body[4 * start:])
+    return b''.join(chunks)
+
+def save_results_to_store(filename, session_results, date=None):
+    """
+    Appends the session results to a binary results store (see
+    ResultsStore), creating it if needed, and updates its indices.
+
+    Parameters:
+    filename (str): The name of the store file.
+    session_results (list): A list of dictionaries containing the session results.
+    date (datetime.date): Date of the results; today by default.
+
+    Returns:
+    int: The total number of records in the store after saving.
+
+    Raises:
+    ValueError: If the file exists but is not a results store; the file is
+        left untouched.
+
+    """
+    ordinal = (date or datetime.date.today()).toordinal()
+    data = b''.join(ResultsStore.RECORD.pack(ordinal, result['x'], result['e'], result['f_x_e'], result['N'])
+                    for result in session_results)
+    with open(filename, 'a+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            f.write(ResultsStore.HEADER.pack(ResultsStore.MAGIC, ResultsStore.VERSION, ResultsStore.RECORD.size))
+        else:
+            # Check the header before anything is written to the file
+            f.seek(0)
+            ResultsStore.check_header(f.read(ResultsStore.HEADER.size))
+            f.seek(0, os.SEEK_END)
+        if size > ResultsStore.HEADER.size:
+            # Drop a partial record left by an interrupted append
+            f.truncate(size - (size - ResultsStore.HEADER.size) % ResultsStore.RECORD.size)
+        f.write(data)
+    store = ResultsStore(filename)
+    try:
+        old_count = store.count - len(session_results)
+        for key in ResultsStore.INDEX_SUFFIXES:
+            old_order = read_results_store_index(filename, key, old_count)
+            if old_order is None:
+                order = store.index(key)
+                body = struct.pack(f'<{len(order)}I', *order)
+            else:
+                new_keys = store.keys(key, old_count)
+                new_order = sorted(range(old_count, store.count), key=lambda i: new_keys[i - old_count])
+                body = merge_results_store_index(store, key, old_order, new_order)
+                if isinstance(old_order, memoryview):
+                    old_order.release()
+            write_results_store_index(filename, key, store.count, body)
+        return store.count
+    finally:
+        store.close()
+
+def export_results_store(filename, output_stream, **query):
+    """
+    Streams the records of a results store matching query (the keyword
+    arguments of ResultsStore.query) to output_stream as lines of the text
+    results format, and returns the number of records written.
+    """
+    store = ResultsStore(filename)
+    try:
+        written = 0
+        for result in store.query(**query):
+            output_stream.write(format_result_line(result, result['date'].strftime("%d.%m.%Y")))
+            written += 1
+        return written
+    finally:
+        store.close()
+
+def save_session(filename, session_results, store=False, fsync=False):
+    """
+    Saves the session results with save_results_to_file and, if store is
+    True, also appends them to the binary store filename + RESULTS_STORE_SUFFIX.
+    Returns the total number of entries in the text file, or None on error.
+    """
+    total_entries = save_results_to_file(filename, session_results, fsync)
+    if total_entries is not None and store:
+        try:
+            save_results_to_store(filename + RESULTS_STORE_SUFFIX, session_results)
+        except (OSError, ValueError) as ex:
+            print("An error occurred while writing to the results store:", ex)
     return total_entries
 
-def main():
+def results_filename_error(filename):
+    """
+    Returns why filename cannot be used as a results file name in main(),
+    or None if it can.
+    """
+    if not (1 <= len(filename) <= 5):
+        return "Filename must be 1 to 5 characters long."
+    if not re.match(r'^[a-zA-Zа-яА-Яіїєє0-9]{1,5}$', filename):
+        return "Filename must contain only Latin/Ukrainian letters and digits."
+    return None
+
+class ResultsWriter:
+    """
+    Background thread that appends results to a results file as soon as
+    they are computed (write-through).
+
+    put() only enqueues the result, so the caller does not wait for the
+    disk unless max_pending results are already waiting. The thread takes
+    every result queued at that moment and saves them together with one
+    save_session call (group commit).
+    """
+
+    def __init__(self, filename, max_pending=1024, store=False, fsync=False):
+        self.filename = filename
+        self.store = store
+        self.fsync = fsync
+        self.total_entries = None  # Entries in the file after the last successful save
+        self.written = 0  # Results of this writer saved so far
+        self.failed = 0  # Results of this writer whose save failed
+        self.commits = 0  # Number of save_session calls
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='ResultsWriter', daemon=True)
+        self._thread.start()
+
+    def put(self, result):
+        """
+        Queues one result dictionary for writing.
+        """
+        if self._closed:
+            raise ValueError("The results writer is closed.")
+        self._queue.put(result)
+
+    def close(self):
+        """
+        Writes every queued result, stops the thread and returns the total
+        number of entries in the file, or None if nothing was saved.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        return self.total_entries
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if batch:
+                total_entries = save_session(self.filename, batch, self.store, self.fsync)
+                self.commits += 1
+                if total_entries is not None:
+                    self.total_entries = total_entries
+                    self.written += len(batch)
+                else:
+                    self.failed += len(batch)
+            if done:
+                return
+
+def main(profile=False, store=False, write_through=None):
     """
     Main function to interact with the user, compute the function values,
-    and handle file operations according to user input.
+    and handle file operations according to user input. With profile=True,
+    the stage timings and counters of every computation are printed; with
+    store=True, saved results are also appended to a binary results store.
+    With write_through set to a results file name, every result is written
+    to that file by a ResultsWriter as soon as it is computed, and ending
+    the session only finalizes the file.
 
     """
+    if write_through is not None and results_filename_error(write_through) is not None:
+        raise ValueError(results_filename_error(write_through))
+    if profile:
+        enable_metrics()
+    writer = ResultsWriter(write_through, store=store) if write_through is not None else None
     session_results = []  # Store results of the current session
     created_files = []  # Keep track of created files in the session
     last_file = None  # Keep track of the last opened file
     max_files = 5  # Maximum number of files allowed to be created
-    while True:
-        x_input = input("Enter the function argument: ")
-        if x_input.strip().lower() == "кінець":
-            if not session_results:
-                print("No results to save.")
-                break
-            save_choice = input("Would you like to save the results to a file? (Yes/No): ").strip()
-            if save_choice.lower() == 'no':
-                print("Data not saved to file")
-                break
-            elif save_choice.lower() == 'yes':
-                if last_file:
-                    save_last_choice = input(f"Save results to the file '{last_file}'? (Yes/No): ").strip()
-                    if save_last_choice.lower() == 'yes':
-                        total_entries = save_results_to_file(last_file, session_results)
-                        if total_entries is not None:
-                            print(f"Data saved to file '{last_file}'. Total number of entries: {total_entries}")
-                        break
-                    elif save_last_choice.lower() == 'no':
-                        if len(created_files) < max_files:
-                            file_prompt = "Enter the name of an existing file or a new file (up to 5 letters, Latin/Ukrainian letters and/or digits) or '*' to cancel and exit: "
+    try:
+        while True:
+            x_input = input("Enter the function argument: ")
+            if x_input.strip().lower() == "кінець":
+                if writer is not None:
+                    total_entries = writer.close()
+                    if writer.failed:
+                        print(f"Failed to save {writer.failed} results to file '{write_through}'.")
+                    if total_entries is not None:
+                        print(f"Data saved to file '{write_through}'. Total number of entries: {total_entries}")
+                    elif not writer.failed:
+                        print("No results to save.")
+                    break
+                if not session_results:
+                    print("No results to save.")
+                    break
+                save_choice = input("Would you like to save the results to a file? (Yes/No): ").strip()
+                if save_choice.lower() == 'no':
+                    print("Data not saved to file")
+                    break
+                elif save_choice.lower() == 'yes':
+                    if last_file:
+                        save_last_choice = input(f"Save results to the file '{last_file}'? (Yes/No): ").strip()
+                        if save_last_choice.lower() == 'yes':
+                            total_entries = save_session(last_file, session_results, store)
+                            if total_entries is not None:
+                                print(f"Data saved to file '{last_file}'. Total number of entries: {total_entries}")
+                            break
+                        elif save_last_choice.lower() == 'no':
+                            if len(created_files) < max_files:
+                                file_prompt = "Enter the name of an existing file or a new file (up to 5 letters, Latin/Ukrainian letters and/or digits) or '*' to cancel and exit: "
+                            else:
+                                file_prompt = "Enter the name of an existing file or '*' to cancel and exit: "
+                            filename = input(file_prompt).strip()
+                            if filename == '*':
+                                print("Data not saved to file")
+                                break
+                            else:
+                                filename_error = results_filename_error(filename)
+                                if filename_error is not None:
+                                    print(filename_error)
+                                    continue
+                                if filename not in created_files and len(created_files) >= max_files:
+                                    print("Cannot create new file. Maximum number of files reached.")
+                                    continue
+                                total_entries = save_session(filename, session_results, store)
+                                if total_entries is not None:
+                                    print(f"Data saved to file '{filename}'. Total number of entries: {total_entries}")
+                                    if filename not in created_files:
+                                        created_files.append(filename)
+                                    last_file = filename
+                                break
                         else:
-                            file_prompt = "Enter the name of an existing file or '*' to cancel and exit: "
+                            print("Invalid input. Please answer 'Yes' or 'No'.")
+                            continue
+                    else:
+                        file_prompt = "Enter a new file name (up to 5 letters, Latin/Ukrainian letters and/or digits) or '*' to cancel and exit: "
                         filename = input(file_prompt).strip()
                         if filename == '*':
                             print("Data not saved to file")
                             break
                         else:
-                            if not (1 <= len(filename) <= 5):
-                                print("Filename must be 1 to 5 characters long.")
-                                continue
-                            if not re.match(r'^[a-zA-Zа-яА-Яіїєє0-9]{1,5}$', filename):
-                                print("Filename must contain only Latin/Ukrainian letters and digits.")
+                            filename_error = results_filename_error(filename)
+                            if filename_error is not None:
+                                print(filename_error)
                                 continue
-                            if filename not in created_files and len(created_files) >= max_files:
-                                print("Cannot create new file. Maximum number of files reached.")
-                                continue
-                            total_entries = save_results_to_file(filename, session_results)
+                            total_entries = save_session(filename, session_results, store)
                             if total_entries is not None:
                                 print(f"Data saved to file '{filename}'. Total number of entries: {total_entries}")
-                                if filename not in created_files:
-                                    created_files.append(filename)
+                                created_files.append(filename)
                                 last_file = filename
                             break
-                    else:
-                        print("Invalid input. Please answer 'Yes' or 'No'.")
-                        continue
                 else:
-                    file_prompt = "Enter a new file name (up to 5 letters, Latin/Ukrainian letters and/or digits) or '*' to cancel and exit: "
-                    filename = input(file_prompt).strip()
-                    if filename == '*':
-                        print("Data not saved to file")
-                        break
+                    print("Invalid input. Please answer 'Yes' or 'No'.")
+                    continue
+            else:
+                try:
+                    x = float(x_input)
+                except ValueError:
+                    print("Invalid input for x. Please enter a number or 'Кінець' to exit.")
+                    continue
+                e_input = input("Enter the precision: ")
+                try:
+                    e = float(e_input)
+                    if not (0 < e < 1):
+                        print("Precision e must be in (0;1).")
+                        continue
+                except ValueError:
+                    print("Invalid input for e. Please enter a number between 0 and 1.")
+                    continue
+                try:
+                    if profile:
+                        reset_stats()
+                    start_time = time.monotonic()
+                    result = SERIES_CACHE.compute(x, e, deadline=15 * 60)  # 15 minutes limit
+                    f_x_e, N = result
+                    computation_time = time.monotonic() - start_time
+                    if profile:
+                        print("Profile:")
+                        print(format_stats(stats()))
+
+                    expected_value = math.log(abs(math.sin(x)))
+                    print(f"X: {x}, Expected: {expected_value}, Actual: {f_x_e}, N: {N}")
+
+                    if isinstance(result, PartialResult):
+                        print("Cannot achieve desired precision within reasonable time.")
+                        print(f"Best result after {N} terms: {f_x_e:.12f} (error at most {result.error_bound:.3g})")
+                        continue
                     else:
-                        if not (1 <= len(filename) <= 5):
-                            print("Filename must be 1 to 5 characters long.")
-                            continue
-                        total_entries = save_results_to_file(filename, session_results)
-                        if total_entries is not None:
-                            print(f"Data saved to file '{filename}'. Total number of entries: {total_entries}")
-                            created_files.append(filename)
-                            last_file = filename
-                        break
+                        print(f"Computation time: {computation_time:.2f} seconds")
+
+                    print(f"f(x, e) = {f_x_e:.12f}")
+                    print(f"N(x, e) = {N}")
+                    result = {
+                        'x': x,
+                        'e': e,
+                        'f_x_e': f_x_e,
+                        'N': N
+                    }
+                    if writer is not None:
+                        writer.put(result)  # Written in the background; nothing is kept in memory
+                    else:
+                        session_results.append(result)
+                except Exception as ex:
+                    print("An error occurred:", ex)
+                    continue
+    finally:
+        if writer is not None:
+            writer.close()
+
+def read_batch_rows(stream):
+    """
+    Generator that streams (line_number, x, e) rows from CSV text with two
+    columns. Blank lines, lines starting with '#' and a header row are
+    skipped; malformed rows are yielded with x = None and the reason in e.
+    """
+    for line_number, row in enumerate(csv.reader(stream), start=1):
+        if not row or not ''.join(row).strip() or row[0].lstrip().startswith('#'):
+            continue
+        if len(row) != 2:
+            yield line_number, None, "Expected two columns: x, e"
+            continue
+        try:
+            yield line_number, float(row[0]), float(row[1])
+        except ValueError:
+            if line_number == 1:
+                continue  # Header row
+            yield line_number, None, "Invalid number"
+
+def evaluate_batch_row(row):
+    """
+    Evaluates one (line_number, x, e) batch row in a worker process.
+
+    Returns:
+    tuple: (line_number, result dictionary or None, error message or None).
+
+    """
+    line_number, x, e = row
+    try:
+        f_x_e, N = SERIES_CACHE.compute(x, e)
+    except (ValueError, TimeoutError) as ex:
+        return line_number, None, str(ex)
+    return line_number, {'x': x, 'e': e, 'f_x_e': f_x_e, 'N': N}, None
+
+def run_batch(input_stream, output_filename, workers=None, max_in_flight=None, error_stream=None):
+    """
+    Evaluates every (x, e) row of input_stream and appends the results to
+    output_filename in the format of save_results_to_file, as they complete.
+
+    Rows are streamed through a process pool with at most max_in_flight rows
+    submitted at a time, so memory stays flat for inputs of any size. Rows
+    that cannot be evaluated are reported on error_stream (stderr by
+    default) without stopping the stream.
+
+    Parameters:
+    input_stream (file): Text stream of CSV rows "x, e".
+    output_filename (str): The results file to append to.
+    workers (int): The number of worker processes; defaults to the number
+        of CPUs. With workers=1 rows are evaluated in this process.
+    max_in_flight (int): Maximum number of submitted but unfinished rows;
+        defaults to 4 per worker.
+
+    Returns:
+    tuple: (number of results saved, number of rows that failed).
+
+    """
+    if error_stream is None:
+        error_stream = sys.stderr
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if max_in_flight is None:
+        max_in_flight = 4 * workers
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be a positive integer.")
+    saved = 0
+    failed = 0
+
+    def report(completed):
+        nonlocal saved, failed
+        results = []
+        for line_number, result, error in completed:
+            if error is not None:
+                print(f"Line {line_number}: {error}", file=error_stream)
+                failed += 1
             else:
-                print("Invalid input. Please answer 'Yes' or 'No'.")
+                results.append(result)
+        if results:
+            if save_results_to_file(output_filename, results) is None:
+                raise OSError(f"Cannot write results to '{output_filename}'")
+            saved += len(results)
+
+    rows = read_batch_rows(input_stream)
+    if workers == 1:
+        for row in rows:
+            report([evaluate_batch_row(row) if row[1] is not None else (row[0], None, row[2])])
+        return saved, failed
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for row in rows:
+            if row[1] is None:
+                report([(row[0], None, row[2])])
                 continue
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                report([future.result() for future in done])
+            in_flight.add(executor.submit(evaluate_batch_row, row))
+        while in_flight:
+            done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            report([future.result() for future in done])
+    return saved, failed
+
+class LnSinService:
+    """
+    asyncio server that answers compute_ln_sin_x requests as JSON lines over
+    TCP or a Unix socket.
+
+    Each request line is {"id": ..., "x": ..., "e": ...}; each response line
+    is {"id": ..., "f_x_e": ..., "N": ...} or {"id": ..., "error": ...}, sent
+    when ready (not necessarily in request order). The CPU work runs in a
+    thread pool, so every client shares the series coefficients and series
+    cache of this process. Identical (x, e) requests in flight are coalesced
+    into one computation, and at most max_pending computations are queued:
+    when the queue is full, the server stops reading from clients.
+    """
+
+    def __init__(self, workers=None, max_pending=64):
+        if max_pending < 1:
+            raise ValueError("max_pending must be a positive integer.")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.stats = {'requests': 0, 'computations': 0, 'coalesced': 0}
+        self._executor = None
+        self._queue = None
+        self._worker_tasks = []
+        self._in_flight = {}  # (x, e) -> asyncio.Future of (f_x_e, N)
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Starts listening on host:port, or on the Unix socket path if given,
+        and returns the asyncio server.
+        """
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path)
         else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        """
+        Stops accepting connections and shuts the workers down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def submit(self, x, e):
+        """
+        Returns a future for compute_ln_sin_x(x, e), joining an identical
+        request already in flight if there is one. Waits while the queue of
+        pending computations is full.
+        """
+        self.stats['requests'] += 1
+        key = (x, e)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return future
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        await self._queue.put((x, e, future))
+        return future
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            x, e, future = await self._queue.get()
             try:
-                x = float(x_input)
-            except ValueError:
-                print("Invalid input for x. Please enter a number or 'Кінець' to exit.")
-                continue
-            e_input = input("Enter the precision: ")
-            try:
-                e = float(e_input)
-                if not (0 < e < 1):
-                    print("Precision e must be in (0;1).")
-                    continue
-            except ValueError:
-                print("Invalid input for e. Please enter a number between 0 and 1.")
-                continue
-            try:
-                start_time = time.time()
-                f_x_e, N = compute_ln_sin_x(x, e)
-                computation_time = time.time() - start_time
+                self.stats['computations'] += 1
+                result = await loop.run_in_executor(self._executor, SERIES_CACHE.compute, x, e)
+                future.set_result(result)
+            except Exception as ex:
+                future.set_exception(ex)
+            finally:
+                del self._in_flight[(x, e)]
+                self._queue.task_done()
 
-                expected_value = math.log(abs(math.sin(x)))
-                print(f"X: {x}, Expected: {expected_value}, Actual: {f_x_e}, N: {N}")
+    async def _handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        responses = set()
+
+        async def respond(request_id, future):
+            try:
+                f_x_e, N = await future
+                response = {'id': request_id, 'f_x_e': f_x_e, 'N': N}
+            except Exception as ex:  # Every request gets an answer, whatever failed
+                response = {'id': request_id, 'error': str(ex) or type(ex).__name__}
+            async with write_lock:
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
 
-                if computation_time > 15 * 60:
-                    print("Cannot achieve desired precision within reasonable time.")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
                     continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get('id')
+                    x = float(request['x'])
+                    e = float(request['e'])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_exception(ValueError("Request must be a JSON object with numeric 'x' and 'e'."))
                 else:
-                    print(f"Computation time: {computation_time:.2f} seconds")
-
-                print(f"f(x, e) = {f_x_e:.12f}")
-                print(f"N(x, e) = {N}")
-                result = {
-                    'x': x,
-                    'e': e,
-                    'f_x_e': f_x_e,
-                    'N': N
-                }
-                session_results.append(result)
-            except TimeoutError as te:
-                print(te)
-                continue
-            except Exception as ex:
-                print("An error occurred:", ex)
-                continue
+                    future = await self.submit(x, e)  # Backpressure: blocks while the queue is full
+                task = asyncio.create_task(respond(request_id, future))
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+            await asyncio.gather(*responses)
+        finally:
+            writer.close()
+
+def serve(host='127.0.0.1', port=8765, path=None, workers=None, max_pending=64):
+    """
+    Runs an LnSinService until interrupted.
+    """
+    async def run():
+        service = LnSinService(workers, max_pending)
+        server = await service.start(host, port, path)
+        address = path if path is not None else ':'.join(str(part) for part in server.sockets[0].getsockname()[:2])
+        print(f"Serving ln|sin(x)| on {address}")
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+def cli(argv=None):
+    """
+    Command-line entry point: runs the interactive session unless one of
+    the non-interactive options is given.
+    """
+    parser = argparse.ArgumentParser(description="Compute f(x) = ln|sin(x)| using its Maclaurin series.")
+    parser.add_argument('--build-bernoulli-table', type=int, metavar='COUNT',
+                        help="compute B_0 ... B_{COUNT-1} into the persistent Bernoulli table and exit")
+    parser.add_argument('--bernoulli-table', default=BERNOULLI_FILE_PATH, metavar='PATH',
+                        help="location of the persistent Bernoulli table (default: %(default)s)")
+    parser.add_argument('--batch', metavar='PATH',
+                        help="evaluate the 'x, e' rows of a CSV file ('-' for stdin) instead of asking interactively")
+    parser.add_argument('--out', metavar='FILE', help="results file for --batch")
+    parser.add_argument('--workers', type=int, help="worker processes for --batch (default: number of CPUs)")
+    parser.add_argument('--max-in-flight', type=int, help="rows submitted at once for --batch (default: 4 per worker)")
+    parser.add_argument('--serve', action='store_true', help="serve JSON-lines requests over TCP or a Unix socket")
+    parser.add_argument('--host', default='127.0.0.1', help="address for --serve (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=8765, help="port for --serve (default: %(default)s)")
+    parser.add_argument('--unix-socket', metavar='PATH', help="serve on a Unix socket instead of TCP")
+    parser.add_argument('--profile', action='store_true', help="print a per-call breakdown of stage timings and counters")
+    parser.add_argument('--store', action='store_true',
+                        help=f"also append saved results to a binary store (results file + '{RESULTS_STORE_SUFFIX}')")
+    parser.add_argument('--write-through', metavar='FILE',
+                        help="write every result to FILE (up to 5 letters and/or digits) as soon as it is computed")
+    parser.add_argument('--export', metavar='STORE', help="print the results in a binary store matching the filters below")
+    parser.add_argument('--x-min', type=float, help="lower bound on x for --export")
+    parser.add_argument('--x-max', type=float, help="upper bound on x for --export")
+    parser.add_argument('--max-e', type=float, help="upper bound on e for --export")
+    args = parser.parse_args(argv)
+    if args.batch is not None and args.out is None:
+        parser.error("--batch requires --out")
+    if args.write_through is not None and results_filename_error(args.write_through) is not None:
+        parser.error(results_filename_error(args.write_through))
+    if args.build_bernoulli_table is not None:
+        start_time = time.time()
+        count = build_bernoulli_file(args.bernoulli_table, args.build_bernoulli_table)
+        print(f"Stored {count} Bernoulli numbers in '{args.bernoulli_table}' "
+              f"in {time.time() - start_time:.2f} seconds")
+        return
+    if args.bernoulli_table != BERNOULLI_FILE_PATH:
+        BERNOULLI_TABLE.use_file(open_bernoulli_file(args.bernoulli_table))
+    if args.batch is not None:
+        if args.batch == '-':
+            saved, failed = run_batch(sys.stdin, args.out, args.workers, args.max_in_flight)
+        else:
+            with open(args.batch, 'r', encoding='utf-8', newline='') as f:
+                saved, failed = run_batch(f, args.out, args.workers, args.max_in_flight)
+        print(f"Saved {saved} results to '{args.out}', {failed} rows failed")
+        return
+    if args.serve:
+        serve(args.host, args.port, args.unix_socket, args.workers)
+        return
+    if args.export is not None:
+        export_results_store(args.export, sys.stdout, x_min=args.x_min, x_max=args.x_max, max_e=args.max_e)
+        return
+    main(profile=args.profile, store=args.store, write_through=args.write_through)
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,54 @@
+import unittest
+from benchmarks.bench import (bench_bernoulli, bench_series, bench_save, compare_reports, machine_metadata, measure,
+                              FORMAT_VERSION)
+
+class TestBenchmarks(unittest.TestCase):
+    def report(self, seconds, spreads=(0.01, 0.4)):
+        return {'version': FORMAT_VERSION, 'metadata': {}, 'benchmarks': [
+            {'name': 'compute_ln_sin_x', 'params': {'x': 0.5, 'e': 0.01}, 'seconds': seconds[0], 'spread': spreads[0]},
+            {'name': 'bernoulli_generator', 'params': {'n': 100}, 'seconds': seconds[1], 'spread': spreads[1]},
+        ]}
+
+    def test_compare_reports(self):
+        """Test that only slowdowns beyond the threshold and each benchmark's own noise are flagged."""
+        baseline = self.report([0.010, 0.000002])
+        # The second benchmark doubles, but its repeats spread by 40% each
+        regressions, missing = compare_reports(baseline, self.report([0.012, 0.000004]), threshold=0.25)
+        self.assertEqual(regressions, [])
+        self.assertEqual(missing, [])
+        regressions, missing = compare_reports(baseline, self.report([0.020, 0.000004]), threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0][0], ('compute_ln_sin_x', (('e', 0.01), ('x', 0.5))))
+        # A steady microsecond benchmark is compared like any other
+        steady = self.report([0.010, 0.000002], spreads=(0.01, 0.01))
+        regressions, missing = compare_reports(steady, self.report([0.010, 0.000004], spreads=(0.01, 0.01)))
+        self.assertEqual([key for key, _, _ in regressions], [('bernoulli_generator', (('n', 100),))])
+        current = self.report([0.010, 0.000002])
+        del current['benchmarks'][1]
+        regressions, missing = compare_reports(baseline, current)
+        self.assertEqual(missing, [('bernoulli_generator', (('n', 100),))])
+        with self.assertRaises(ValueError):
+            compare_reports(baseline, {'version': -1, 'benchmarks': []})
+
+    def test_benchmarks_run(self):
+        """Test that every benchmark produces positive timings on a small grid."""
+        results = bench_bernoulli(1, indices=(10,)) + bench_series(1, arguments=(0.5,), precisions=(1e-5,))
+        results += bench_save(1, sizes=(0, 10), batch=5)
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self.assertGreater(result['seconds'], 0)
+        self.assertIn('python', machine_metadata())
+
+    def test_measure(self):
+        """Test that fast functions are called in a loop and the median time per call is reported."""
+        calls = []
+        seconds, spread = measure(lambda: calls.append(None), 5, min_time=0.001)
+        self.assertGreater(len(calls), 6)  # More than one call per repeat
+        self.assertGreater(seconds, 0)
+        self.assertGreaterEqual(spread, 0)
+        calls.clear()
+        measure(lambda: calls.append(None), 5, min_time=0)
+        self.assertEqual(len(calls), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from main import (BERNOULLI_ENGINES, BERNOULLI_TABLE, ASYMPTOTIC_LOG_ENGINE, TableEngine, BernoulliFile, build_bernoulli_file, select_bernoulli_engine,
+                  benchmark_bernoulli_engines, bernoulli_fractions, compute_bernoulli_pairs_generator)
+from fractions import Fraction
+import math
+import os
+import tempfile
+
+class TestBernoulliEngines(unittest.TestCase):
+    def test_engines_agree(self):
+        """Test that every engine returns the same exact fractions."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            filename = tmp_file.name
+        try:
+            build_bernoulli_file(filename, 81)
+            bernoulli_file = BernoulliFile(filename)
+            pairs = compute_bernoulli_pairs_generator()
+            expected_values = [Fraction(*next(pairs)) for _ in range(81)]
+            engines = dict(BERNOULLI_ENGINES, table=TableEngine(bernoulli_file))
+            indices = [80, 0, 1, 2, 7, 12, 44]
+            for name, engine in engines.items():
+                with self.subTest(engine=name):
+                    self.assertEqual(engine.fractions(indices), [expected_values[n] for n in indices])
+            self.assertFalse(engines['table'].available(81))
+            bernoulli_file.close()
+        finally:
+            os.remove(filename)
+
+    def test_table_follows_override(self):
+        """Test that the shared table engine reads the file the shared Bernoulli table was switched to."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            filename = tmp_file.name
+        original_file = BERNOULLI_TABLE.bernoulli_file
+        try:
+            build_bernoulli_file(filename, 41)
+            bernoulli_file = BernoulliFile(filename)
+            BERNOULLI_TABLE.use_file(bernoulli_file)
+            self.assertIs(BERNOULLI_ENGINES['table'].bernoulli_file, bernoulli_file)
+            self.assertTrue(BERNOULLI_ENGINES['table'].available(40))
+            self.assertFalse(BERNOULLI_ENGINES['table'].available(41))
+            BERNOULLI_TABLE.use_file(original_file)
+            bernoulli_file.close()
+        finally:
+            BERNOULLI_TABLE.use_file(original_file)
+            os.remove(filename)
+
+    def test_selection_policy(self):
+        """Test that dense ranges use the tangent recurrence and single large indices use McGown."""
+        engines = {name: BERNOULLI_ENGINES[name] for name in ('mcgown', 'tangent')}
+        self.assertEqual(select_bernoulli_engine(400, 200, engines).name, 'tangent')
+        self.assertEqual(select_bernoulli_engine(1000, 1, engines).name, 'mcgown')
+        self.assertEqual(bernoulli_fractions([2, 4, 6]), [Fraction(1, 6), Fraction(-1, 30), Fraction(1, 42)])
+        self.assertEqual(bernoulli_fractions([10], engine='tangent'), [Fraction(5, 66)])
+        with self.assertRaises(ValueError):
+            select_bernoulli_engine(10, 1, {})
+
+    def test_benchmark(self):
+        """Test that the micro-benchmark fits a cost model for every engine."""
+        engines = {name: BERNOULLI_ENGINES[name] for name in ('mcgown', 'tangent')}
+        model = benchmark_bernoulli_engines(max_indices=(20, 40), engines=engines, repeat=1)
+        self.assertEqual(set(model), {'mcgown', 'tangent'})
+        for coefficient, exponent in model.values():
+            self.assertGreater(coefficient, 0)
+
+    def test_asymptotic_log_engine(self):
+        """Test ln|B_n| and its sign from the asymptotic engine against the exact numbers."""
+        indices = list(range(0, 401, 2)) + [1]
+        for n, B_n in zip(indices, BERNOULLI_ENGINES['tangent'].fractions(indices)):
+            with self.subTest(n=n):
+                ln_B_n, sign = ASYMPTOTIC_LOG_ENGINE.log_abs(n)
+                expected = math.log(abs(B_n.numerator)) - math.log(B_n.denominator)
+                self.assertAlmostEqual(ln_B_n, expected, delta=4e-15 * max(abs(expected), 1))
+                self.assertEqual(sign, 1 if B_n > 0 else -1)
+        self.assertAlmostEqual(ASYMPTOTIC_LOG_ENGINE.ln_zeta(2), math.log(math.pi ** 2 / 6), places=15)
+        self.assertAlmostEqual(ASYMPTOTIC_LOG_ENGINE.ln_zeta(50), 2.0 ** -50, places=20)
+        # Far beyond the float range of B_n
+        self.assertTrue(math.isfinite(ASYMPTOTIC_LOG_ENGINE.log_abs(20000)[0]))
+        with self.assertRaises(ValueError):
+            ASYMPTOTIC_LOG_ENGINE.log_abs(3)
+
+if __name__ == '__main__':
+    unittest.main()
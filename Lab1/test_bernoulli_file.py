@@ -0,0 +1,71 @@
+import unittest
+from main import (BernoulliFile, BernoulliTable, build_bernoulli_file, open_bernoulli_file,
+                  compute_bernoulli_pairs_generator, compute_bernoulli_numbers_generator, cli)
+import os
+import tempfile
+from unittest.mock import patch
+
+class TestBernoulliFile(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            self.filename = tmp_file.name
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        """Test that the stored pairs match the generator exactly."""
+        self.assertEqual(build_bernoulli_file(self.filename, 120), 120)
+        bernoulli_file = BernoulliFile(self.filename)
+        try:
+            self.assertEqual(len(bernoulli_file), 120)
+            pairs = compute_bernoulli_pairs_generator()
+            for n in range(120):
+                with self.subTest(n=n):
+                    self.assertEqual(bernoulli_file.pair(n), next(pairs))
+            with self.assertRaises(IndexError):
+                bernoulli_file.pair(120)
+        finally:
+            bernoulli_file.close()
+
+    def test_corruption_detected(self):
+        """Test that damaged records and files are rejected."""
+        build_bernoulli_file(self.filename, 30)
+        with open(self.filename, 'r+b') as f:
+            f.seek(-6, os.SEEK_END)  # Inside the last record
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        bernoulli_file = BernoulliFile(self.filename)
+        try:
+            bernoulli_file.pair(0)
+            with self.assertRaises(ValueError):
+                bernoulli_file.pair(29)
+        finally:
+            bernoulli_file.close()
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a table')
+        self.assertIsNone(open_bernoulli_file(self.filename))
+
+    def test_table_extends_beyond_file(self):
+        """Test that the shared table decodes stored numbers and only generates the rest."""
+        build_bernoulli_file(self.filename, 40)
+        table = BernoulliTable(bernoulli_file=BernoulliFile(self.filename))
+        expected_values = list(zip(range(61), compute_bernoulli_numbers_generator()))
+        table.get(38)
+        self.assertIsNone(table._generator)
+        for n, expected_value in expected_values:
+            with self.subTest(n=n):
+                self.assertEqual(table.get(n), expected_value)
+        table.bernoulli_file.close()
+
+    def test_build_command(self):
+        """Test building the table from the command line."""
+        with patch('builtins.print'):
+            cli(['--build-bernoulli-table', '10', '--bernoulli-table', self.filename])
+        bernoulli_file = BernoulliFile(self.filename)
+        self.assertEqual(len(bernoulli_file), 10)
+        bernoulli_file.close()
+
+if __name__ == '__main__':
+    unittest.main()
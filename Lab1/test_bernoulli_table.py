@@ -0,0 +1,92 @@
+import unittest
+import threading
+import sys
+from main import BernoulliTable, BERNOULLI_TABLE, compute_bernoulli_numbers_generator, compute_ln_sin_x, Deadline, DeadlineExceeded, LOG_COEFFICIENT_TABLE, LogCoefficientTable
+import math
+
+class TestBernoulliTable(unittest.TestCase):
+    def test_values_match_generator(self):
+        """Test that the table returns the same values as the generator."""
+        table = BernoulliTable()
+        bernoulli_gen = compute_bernoulli_numbers_generator()
+        expected_values = [next(bernoulli_gen) for _ in range(40)]
+        for n in reversed(range(40)):
+            with self.subTest(n=n):
+                self.assertEqual(table.get(n), expected_values[n])
+
+    def test_eviction(self):
+        """Test that the table respects max_entries and regenerates evicted values."""
+        table = BernoulliTable(max_entries=5)
+        B_2 = table.get(2)
+        table.get(20)
+        self.assertEqual(len(table), 5)
+        self.assertNotIn(2, table)
+        self.assertEqual(table.get(2), B_2)
+
+    def test_memory_cap(self):
+        """Test that max_bytes bounds the memory of the stored values, not their count."""
+        table = BernoulliTable(max_bytes=2000)
+        B_2 = table.get(2)
+        for n in range(0, 400, 2):
+            table.get(n)
+            self.assertLessEqual(table.size_bytes, 2000)
+        self.assertNotIn(2, table)
+        self.assertEqual(table.get(2), B_2)
+        # A single value larger than the cap is still kept
+        small_table = BernoulliTable(max_bytes=1)
+        self.assertEqual(small_table.get(100), table.get(100))
+        self.assertEqual(len(small_table), 1)
+
+    def test_invalid_arguments(self):
+        """Test that invalid indices and caps are rejected."""
+        with self.assertRaises(ValueError):
+            BernoulliTable(max_entries=0)
+        with self.assertRaises(ValueError):
+            BernoulliTable(max_bytes=0)
+        with self.assertRaises(ValueError):
+            BernoulliTable().get(-1)
+
+    def test_concurrent_access(self):
+        """Test that several threads can fill the table at the same time."""
+        table = BernoulliTable()
+        results = {}
+
+        def worker(n):
+            results[n] = table.get(n)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(0, 60, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        bernoulli_gen = compute_bernoulli_numbers_generator()
+        expected_values = [next(bernoulli_gen) for _ in range(60)]
+        for n, value in results.items():
+            self.assertEqual(value, expected_values[n])
+
+    def test_deadline(self):
+        """Test that an expired deadline stops the generator and the table but keeps the values generated so far."""
+        deadline = Deadline()
+        deadline.cancel()
+        self.assertEqual(list(compute_bernoulli_numbers_generator(0, deadline)), [])
+        table = BernoulliTable()
+        B_10 = table.get(10)
+        with self.assertRaises(DeadlineExceeded):
+            table.get(100, deadline)
+        self.assertEqual(table.get(10, deadline), B_10)
+        self.assertEqual(table.get(100, Deadline(60)), table.get(100))
+
+    def test_shared_by_exact_coefficients(self):
+        """Test that exact series coefficients fill and reuse the shared table, and float mode does not need it."""
+        BERNOULLI_TABLE.clear()
+        LOG_COEFFICIENT_TABLE.clear()
+        compute_ln_sin_x(math.pi / 6, 1e-10)
+        self.assertEqual(len(BERNOULLI_TABLE), 0)
+        LogCoefficientTable(source='exact').ensure(10)
+        size = len(BERNOULLI_TABLE)
+        self.assertTrue(size > 0)
+        LogCoefficientTable(source='exact').ensure(10)
+        self.assertEqual(len(BERNOULLI_TABLE), size)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from main import ChebyshevApproximation, CHEBYSHEV_APPROXIMATION, compute_ln_sin_x, compute_ln_sin_x_decimal
+from decimal import Decimal
+import math
+
+class TestChebyshevApproximation(unittest.TestCase):
+    def test_dense_grid_against_decimal(self):
+        """Test that the error on a dense grid stays within the guaranteed bound, or the series is used."""
+        grid = [math.pi / 2 * k / 1000 for k in range(1, 1001)] + [1e-8, 1e-4, 1e-2, 0.00825]
+        references = [compute_ln_sin_x_decimal(Decimal(x), Decimal('1e-30'), True, 30)[0] for x in grid]
+        for e in [1e-2, 1e-6, 1e-10, 1e-15, 5e-16]:
+            with self.subTest(e=e):
+                worst = 0.0
+                for x, reference in zip(grid, references):
+                    n = CHEBYSHEV_APPROXIMATION.term_count(e, x)
+                    f_x_e, N = compute_ln_sin_x(x, e, fast=True)
+                    if n is None:
+                        self.assertEqual((f_x_e, N), compute_ln_sin_x(x, e))
+                        continue
+                    self.assertEqual(N, n)
+                    bound = CHEBYSHEV_APPROXIMATION.error_bound(n, x)
+                    self.assertLessEqual(bound, e)
+                    worst = max(worst, float(abs(Decimal(f_x_e) - reference)) / bound)
+                self.assertLessEqual(worst, 1.0)
+        # ln(x) alone is rounded by more than e here
+        self.assertIsNone(CHEBYSHEV_APPROXIMATION.term_count(5e-16, 0.00825))
+
+    def test_term_count(self):
+        """Test that tighter precisions use more terms and the bound falls with n."""
+        counts = [CHEBYSHEV_APPROXIMATION.term_count(e) for e in [1e-2, 1e-5, 1e-10, 1e-15]]
+        self.assertEqual(counts, sorted(counts))
+        bounds = [CHEBYSHEV_APPROXIMATION.error_bound(n) for n in range(1, 20)]
+        self.assertEqual(bounds, sorted(bounds, reverse=True))
+
+    def test_fallback_to_series(self):
+        """Test that precisions beyond the polynomial bound use the series."""
+        self.assertIsNone(CHEBYSHEV_APPROXIMATION.term_count(1e-17))
+        for x in [0.3, -1.2, 2.8]:
+            with self.subTest(x=x):
+                self.assertEqual(compute_ln_sin_x(x, 1e-17, fast=True), compute_ln_sin_x(x, 1e-17))
+        for x in [math.pi, math.nan, math.inf, -math.inf]:
+            with self.subTest(x=x):
+                with self.assertRaises(ValueError):
+                    compute_ln_sin_x(x, 0.01, fast=True)
+
+    def test_fewer_coefficients(self):
+        """Test that a shorter expansion has a looser bound and still matches the shared one."""
+        approximation = ChebyshevApproximation(count=12)
+        self.assertIsNone(approximation.term_count(1e-15))
+        n = approximation.term_count(1e-8)
+        self.assertEqual(n, CHEBYSHEV_APPROXIMATION.term_count(1e-8))
+        self.assertAlmostEqual(approximation.evaluate(1.0, n), CHEBYSHEV_APPROXIMATION.evaluate(1.0, n), places=14)
+
+if __name__ == '__main__':
+    unittest.main()
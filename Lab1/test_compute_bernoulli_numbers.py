@@ -1,5 +1,9 @@
 import unittest
-from main import compute_bernoulli_numbers_generator
+import time
+from decimal import Decimal, getcontext, localcontext
+from main import compute_bernoulli_numbers_generator, bernoulli, bernoulli_list, bernoulli_range
+from unittest.mock import patch
+import concurrent.futures
 
 class TestComputeBernoulliNumbers(unittest.TestCase):
     def test_bernoulli_number_values(self):
@@ -68,5 +72,79 @@ class TestComputeBernoulliNumbers(unittest.TestCase):
                 print(f"n: {n}, Expected: {expected_value}, Actual: {actual_values[n]}")
                 self.assertAlmostEqual(float(actual_values[n]), expected_value, places=20)
 
+    def test_large_n_timing(self):
+        """Test that generating B_0 to B_1000 takes near-linear time."""
+        bernoulli_gen = compute_bernoulli_numbers_generator()
+        start_time = time.time()
+        values = [next(bernoulli_gen) for _ in range(1001)]
+        computation_time = time.time() - start_time
+        # B_1000 = -5.318704469415522036482914...e+1769
+        expected_value = Decimal('-5.318704469415522036482914E+1769')
+        self.assertAlmostEqual(values[1000] / expected_value, 1, places=20)
+        self.assertLess(computation_time, 2.0)
+
+    def test_bernoulli_random_access(self):
+        """Test that bernoulli(n) agrees with the generator."""
+        bernoulli_gen = compute_bernoulli_numbers_generator()
+        generated_values = [next(bernoulli_gen) for _ in range(301)]
+        for n in [0, 1, 2, 3, 4, 10, 51, 100, 222, 300]:
+            with self.subTest(n=n):
+                if generated_values[n] == 0:
+                    self.assertEqual(bernoulli(n), 0)
+                else:
+                    self.assertAlmostEqual(bernoulli(n) / generated_values[n], 1, places=40)
+        with self.assertRaises(ValueError):
+            bernoulli(-1)
+
+    def test_bernoulli_range(self):
+        """Test that bernoulli_range returns the values in order, serially and in parallel."""
+        expected_values = [bernoulli(n) for n in range(90, 131)]
+        for workers in [1, 2]:
+            with self.subTest(workers=workers):
+                actual_values = bernoulli_range(90, 131, workers=workers)
+                self.assertEqual(len(actual_values), len(expected_values))
+                for expected_value, actual_value in zip(expected_values, actual_values):
+                    if expected_value == 0:
+                        self.assertEqual(actual_value, 0)
+                    else:
+                        self.assertAlmostEqual(actual_value / expected_value, 1, places=40)
+        self.assertEqual(bernoulli_range(5, 5), [])
+        with self.assertRaises(ValueError):
+            bernoulli_range(10, 5)
+        # Every chunk sent to a worker mixes cheap and costly indices
+        chunks = []
+
+        def record_chunk(indices):
+            chunks.append(indices)
+            return bernoulli_list(indices)
+
+        with patch('main.concurrent.futures.ProcessPoolExecutor', concurrent.futures.ThreadPoolExecutor), \
+                patch('main.bernoulli_list', side_effect=record_chunk):
+            bernoulli_range(2, 130, workers=2)
+        self.assertEqual(len(chunks), 16)
+        self.assertEqual(sorted(n for chunk in chunks for n in chunk), list(range(2, 130, 2)))
+        for chunk in chunks:
+            self.assertLessEqual(min(chunk), 32)
+            self.assertGreaterEqual(max(chunk), 98)
+        with self.assertRaises(ValueError):
+            bernoulli_range(0, 10, workers=0)
+
+    def test_exact_numerators(self):
+        """Test that large-index numerators are exact and the global context is untouched."""
+        precision_before = getcontext().prec
+        known_fractions = {
+            60: (-1215233140483755572040304994079820246041491, 56786730),
+            100: (-94598037819122125295227433069493721872702841533066936133385696204311395415197247711, 33330),
+        }
+        bernoulli_gen = compute_bernoulli_numbers_generator()
+        values = [next(bernoulli_gen) for _ in range(101)]
+        for n, (numerator, denominator) in known_fractions.items():
+            with self.subTest(n=n):
+                for value in (values[n], bernoulli(n)):
+                    with localcontext() as ctx:
+                        ctx.prec = 200
+                        self.assertEqual((value * denominator).to_integral_value(), numerator)
+        self.assertEqual(getcontext().prec, precision_before)
+
 if __name__ == '__main__':
     unittest.main()
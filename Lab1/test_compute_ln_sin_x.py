@@ -1,6 +1,8 @@
 import unittest
-from main import compute_ln_sin_x
+from main import (compute_ln_sin_x, compute_ln_sin_x_decimal, predict_term_count, reduce_argument, LOG_COEFFICIENT_TABLE,
+                  EXACT_BERNOULLI_TABLE, Deadline, PartialResult)
 import math
+from decimal import Decimal, localcontext
 from unittest.mock import patch
 
 class TestComputeLnSinX(unittest.TestCase):
@@ -21,12 +23,16 @@ class TestComputeLnSinX(unittest.TestCase):
 
     def test_invalid_x_values(self):
         """Test compute_ln_sin_x with invalid x values."""
-        invalid_x_values = [0, math.pi, -math.pi, 2 * math.pi]
+        invalid_x_values = [0, math.pi, -math.pi, 2 * math.pi, math.nan, math.inf, -math.inf]
         e = 0.001
         for x in invalid_x_values:
             with self.subTest(x=x):
                 with self.assertRaises(ValueError):
                     compute_ln_sin_x(x, e)
+        for x in [Decimal('NaN'), Decimal('Infinity'), Decimal('-Infinity'), Decimal(4), Decimal(0)]:
+            with self.subTest(x=x):
+                with self.assertRaises(ValueError):
+                    compute_ln_sin_x_decimal(x, e)
 
     def test_invalid_e_values(self):
         """Test compute_ln_sin_x with invalid e values."""
@@ -79,12 +85,136 @@ class TestComputeLnSinX(unittest.TestCase):
             compute_ln_sin_x(x, e)
 
     def test_timeout(self):
-        """Test compute_ln_sin_x to trigger a TimeoutError using time mocking."""
+        """Test that an expired deadline returns the best result so far with its error bound using time mocking."""
         x = math.pi / 6
         e = 1e-10  # Small e to ensure computation takes longer
-        with patch('time.time', side_effect=[0, 15*60 + 1]):
-            with self.assertRaises(TimeoutError):
-                compute_ln_sin_x(x, e)
+        with patch('time.monotonic', side_effect=[0, 15*60 + 1]):
+            result = compute_ln_sin_x(x, e, deadline=15*60)
+        self.assertIsInstance(result, PartialResult)
+        f_x_e, N = result
+        self.assertEqual(N, 0)
+        self.assertLessEqual(abs(f_x_e - float(self.reference_ln_sin(x))), result.error_bound)
+
+    def test_cancelled_deadline(self):
+        """Test that a cancelled deadline stops every precision mode with a valid error bound."""
+        deadline = Deadline()
+        deadline.cancel()
+        self.assertTrue(deadline.expired())
+        for precision in ['float', 'decimal']:
+            with self.subTest(precision=precision):
+                result = compute_ln_sin_x(1.0, 1e-20, precision=precision, deadline=deadline)
+                self.assertIsInstance(result, PartialResult)
+                self.assertLessEqual(abs(float(result[0]) - float(self.reference_ln_sin(1.0))), result.error_bound)
+
+    def test_deadline_during_bernoulli_generation(self):
+        """Test that the Decimal path stops inside the Bernoulli number generation when the deadline expires."""
+        deadline = Deadline()
+        checks = []
+
+        def expired():
+            checks.append(None)
+            return len(checks) > 1  # Expires after the first check
+
+        with patch.object(deadline, 'expired', side_effect=expired):
+            result = compute_ln_sin_x(1.55, Decimal('1e-900'), precision='decimal', deadline=deadline)
+        self.assertIsInstance(result, PartialResult)
+        self.assertEqual(result[1], 0)
+        self.assertEqual(len(checks), 2)
+        self.assertLessEqual(abs(float(result[0]) - float(self.reference_ln_sin(1.55))), result.error_bound)
+
+    def test_exact_bernoulli_numbers_shared(self):
+        """Test that repeated Decimal evaluations reuse the exact Bernoulli numbers of the shared table."""
+        EXACT_BERNOULLI_TABLE.clear()
+        first = compute_ln_sin_x(1.2, Decimal('1e-60'), precision='decimal')
+        count = len(EXACT_BERNOULLI_TABLE)
+        self.assertGreater(count, first[1])
+        with patch('main.bernoulli_fractions', side_effect=AssertionError("Bernoulli numbers recomputed")):
+            self.assertEqual(compute_ln_sin_x(1.2, Decimal('1e-60'), precision='decimal'), first)
+            self.assertEqual(compute_ln_sin_x(-0.7, Decimal('1e-60'), precision='decimal')[0],
+                             compute_ln_sin_x(0.7, Decimal('1e-60'), precision='decimal')[0])
+        self.assertEqual(len(EXACT_BERNOULLI_TABLE), count)
+
+    def test_deadline_not_reached(self):
+        """Test that a generous deadline returns a plain result."""
+        result = compute_ln_sin_x(1.0, 1e-12, deadline=60)
+        self.assertNotIsInstance(result, PartialResult)
+        self.assertEqual(result, compute_ln_sin_x(1.0, 1e-12))
+
+    def test_predicted_term_count(self):
+        """Test that the predicted number of terms is within one of the exact N."""
+        for x in [0.001, 0.3, 1.0, math.pi / 2, 2.5, -3.0]:
+            for e in [0.1, 1e-5, 1e-15, 1e-100]:
+                with self.subTest(x=x, e=e):
+                    f_x_e, N = compute_ln_sin_x(x, e)
+                    self.assertLessEqual(abs(predict_term_count(reduce_argument(x), e) - N), 1)
+
+    def test_impossible_precision_rejected_early(self):
+        """Test that an unreachable precision is rejected before any terms are computed."""
+        LOG_COEFFICIENT_TABLE.clear()
+        with patch('main.MAX_SERIES_TERMS', 5):
+            with self.assertRaises(ValueError):
+                compute_ln_sin_x(math.pi / 2 - 0.01, 1e-15)
+            # A Decimal e far below the float range is rejected the same way
+            with self.assertRaisesRegex(ValueError, "Cannot achieve desired precision"):
+                compute_ln_sin_x(1.0, Decimal('1e-1200'))
+        self.assertEqual(len(LOG_COEFFICIENT_TABLE), 0)
+        f_x_e, N = compute_ln_sin_x(1.0, Decimal('1e-1200'))
+        self.assertGreater(N, 1000)
+        with self.assertRaisesRegex(ValueError, "Cannot achieve desired precision"):
+            compute_ln_sin_x(1.0, Decimal('1e-12000'))
+
+    def test_argument_reduction(self):
+        """Test that the ln|cos| reduction keeps N bounded across the domain."""
+        e = 1e-15
+        max_N = 0
+        for i in range(1, 314):
+            x = i * 0.01
+            with self.subTest(x=x):
+                f_x_e, N = compute_ln_sin_x(x, e, reduction=True)
+                self.assertAlmostEqual(f_x_e, math.log(abs(math.sin(x))), places=12)
+                max_N = max(max_N, N)
+        self.assertLessEqual(max_N, 16)
+        self.assertEqual(compute_ln_sin_x(math.pi / 2, e, reduction=True), (0.0, 0))
+
+    def reference_ln_sin(self, x, prec=80):
+        """High-precision ln|sin(x)| from the Taylor series of sin."""
+        with localcontext() as ctx:
+            ctx.prec = prec
+            x = Decimal(x)
+            sin_x, term, n = Decimal(0), x, 1
+            while abs(term) > Decimal(10) ** -(prec + 5):
+                sin_x += term
+                term = -term * x * x / ((n + 1) * (n + 2))
+                n += 2
+            return abs(sin_x).ln()
+
+    def test_decimal_precision(self):
+        """Test that the Decimal mode reaches tolerances the float mode cannot."""
+        e = 1e-24
+        for x in [1e-8, 0.5, 1.5, -3.0, math.pi - 1e-10]:
+            for reduction in [False, True]:
+                with self.subTest(x=x, reduction=reduction):
+                    f_x_e, N = compute_ln_sin_x(x, e, reduction=reduction, precision='decimal')
+                    self.assertIsInstance(f_x_e, Decimal)
+                    # The series stops when the next term is below e; the tail is a few times e at most
+                    self.assertLess(abs(f_x_e - self.reference_ln_sin(x)), 5 * Decimal(e))
+
+    def test_decimal_digits(self):
+        """Test that digits=k returns k significant digits."""
+        f_x_e, N = compute_ln_sin_x(1.0, Decimal('1e-60'), digits=70)
+        self.assertEqual(len(f_x_e.as_tuple().digits), 70)
+        self.assertLess(abs(f_x_e - self.reference_ln_sin(1.0, 100)), Decimal('1e-59'))
+        with self.assertRaises(ValueError):
+            compute_ln_sin_x(1.0, 1e-10, precision='quad')
+        with self.assertRaises(ValueError):
+            compute_ln_sin_x(math.pi, 1e-10, precision='decimal')
+
+    def test_compensated_float_summation(self):
+        """Test that the float mode stays within double rounding of the reference."""
+        for x in [0.5, 1.0, 1.5, math.pi / 2]:
+            with self.subTest(x=x):
+                f_x_e, N = compute_ln_sin_x(x, 1e-17)
+                self.assertLess(abs(Decimal(f_x_e) - self.reference_ln_sin(x)), Decimal('1e-15'))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from main import compute_ln_sin_x, compute_ln_sin_x_batch
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestComputeLnSinXBatch(unittest.TestCase):
+    def test_matches_scalar(self):
+        """Test that the batch results match compute_ln_sin_x element by element."""
+        xs = np.linspace(-math.pi + 0.01, math.pi - 0.01, 101)
+        xs = xs[xs != 0]
+        for e in [0.01, 1e-8, 1e-15]:
+            f_x_e, N, errors = compute_ln_sin_x_batch(xs, e)
+            self.assertFalse(errors.any())
+            for x, f_value, N_value in zip(xs, f_x_e, N):
+                with self.subTest(x=x, e=e):
+                    expected_f, expected_N = compute_ln_sin_x(float(x), e)
+                    self.assertAlmostEqual(f_value, expected_f, places=12)
+                    self.assertEqual(N_value, expected_N)
+
+    def test_per_element_precision(self):
+        """Test that e can be given per element and the output keeps the input shape."""
+        xs = np.array([[0.5, 1.0], [1.5, -2.0]])
+        e = np.array([[0.1, 1e-5], [1e-10, 1e-15]])
+        f_x_e, N, errors = compute_ln_sin_x_batch(xs, e)
+        self.assertEqual(f_x_e.shape, (2, 2))
+        self.assertEqual(N.shape, (2, 2))
+        for index in np.ndindex(xs.shape):
+            expected_f, expected_N = compute_ln_sin_x(xs[index], e[index])
+            self.assertAlmostEqual(f_x_e[index], expected_f, places=12)
+            self.assertEqual(N[index], expected_N)
+
+    def test_invalid_elements(self):
+        """Test that invalid elements are masked instead of failing the whole batch."""
+        xs = np.array([0.0, math.pi, -math.pi, 4.0, np.nan, 0.5, 0.5])
+        e = np.array([0.01, 0.01, 0.01, 0.01, 0.01, 1.5, 0.01])
+        f_x_e, N, errors = compute_ln_sin_x_batch(xs, e)
+        self.assertEqual(errors.tolist(), [True] * 6 + [False])
+        self.assertTrue(np.isnan(f_x_e[:6]).all())
+        self.assertTrue((N[:6] == 0).all())
+        self.assertAlmostEqual(f_x_e[6], math.log(math.sin(0.5)), places=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from main import LnSinSeries, LnSinSeriesCache, compute_ln_sin_x, PartialResult
+import math
+from unittest.mock import patch
+
+class TestLnSinSeries(unittest.TestCase):
+    def test_refine_matches_compute(self):
+        """Test that refining one series gives the same results as fresh computations."""
+        for reduction in [False, True]:
+            series = LnSinSeries(1.3, reduction)
+            for e in [1e-6, 1e-12, 1e-3, 1e-15]:
+                with self.subTest(reduction=reduction, e=e):
+                    self.assertEqual(series.refine(e), compute_ln_sin_x(1.3, e, reduction))
+
+    def test_refine_sums_only_new_terms(self):
+        """Test that a tighter precision continues from the stored partial sum."""
+        series = LnSinSeries(math.pi / 6)
+        f_x_e, N = series.refine(1e-6)
+        self.assertEqual(series.n, N)
+        partial_sums = list(series.partial_sums)
+        f_x_e, N_tight = series.refine(1e-12)
+        self.assertGreater(N_tight, N)
+        self.assertEqual(series.partial_sums[:N + 1], partial_sums)
+        self.assertEqual(len(series.ln_terms), N_tight + 1)
+        # A looser precision is answered without summing anything
+        series.refine(1e-3)
+        self.assertEqual(series.n, N_tight)
+
+    def test_resume_after_deadline(self):
+        """Test that a series stopped by its deadline resumes where it stopped."""
+        expected = compute_ln_sin_x(1.5, 1e-100)  # Also fills the shared coefficient table
+        series = LnSinSeries(1.5)
+        f_x_e, N = series.refine(1e-12)
+        with patch('time.monotonic', side_effect=[0, 0, 0, 15*60 + 1]):
+            partial = series.refine(1e-100, deadline=15*60)
+        self.assertIsInstance(partial, PartialResult)
+        self.assertGreater(partial[1], N)
+        self.assertLess(partial.error_bound, 1e-12)
+        self.assertEqual(series.refine(1e-100), expected)
+
+    def test_invalid_inputs(self):
+        """Test that invalid x and e are rejected."""
+        with self.assertRaises(ValueError):
+            LnSinSeries(math.pi)
+        with self.assertRaises(ValueError):
+            LnSinSeries(0.5).refine(1.5)
+
+class TestLnSinSeriesCache(unittest.TestCase):
+    def test_cache_reuses_series(self):
+        """Test that the cache returns the same series for the same x."""
+        cache = LnSinSeriesCache(maxsize=2)
+        series = cache.get(0.5)
+        self.assertIs(cache.get(0.5), series)
+        self.assertEqual(cache.compute(0.5, 1e-10), compute_ln_sin_x(0.5, 1e-10))
+        self.assertEqual(series.n, cache.compute(0.5, 1e-10)[1])
+
+    def test_eviction_and_resize(self):
+        """Test that least recently used series are evicted."""
+        cache = LnSinSeriesCache(maxsize=2)
+        first_series = cache.get(0.1)
+        cache.get(0.2)
+        cache.get(0.1)
+        cache.get(0.3)  # Evicts 0.2
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(0.1), first_series)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        with self.assertRaises(ValueError):
+            cache.resize(0)
+        with self.assertRaises(ValueError):
+            cache.compute(0.1, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from main import LogCoefficientTable, bernoulli
+import json
+import math
+import os
+import tempfile
+
+class TestLogCoefficientTable(unittest.TestCase):
+    def test_coefficients(self):
+        """Test the coefficients against the direct term formula."""
+        coefficients, signs = LogCoefficientTable().ensure(30)
+        for n in range(1, 31):
+            with self.subTest(n=n):
+                B_2n = float(bernoulli(2 * n))
+                expected_coefficient = (2 * n - 1) * math.log(2) + math.log(abs(B_2n)) - math.log(n) - math.lgamma(2 * n + 1)
+                expected_sign = (-1) ** (n - 1) * (1 if B_2n > 0 else -1)
+                self.assertAlmostEqual(coefficients[n], expected_coefficient, places=10)
+                self.assertEqual(signs[n], expected_sign)
+
+    def test_cos_coefficients(self):
+        """Test the ln|cos| coefficients against the direct term formula."""
+        cos_coefficients, signs = LogCoefficientTable().ensure(30, 'cos')
+        for n in range(1, 31):
+            with self.subTest(n=n):
+                B_2n = float(bernoulli(2 * n))
+                expected_coefficient = ((2 * n - 1) * math.log(2) + math.log(2 ** (2 * n) - 1) + math.log(abs(B_2n))
+                                        - math.log(n) - math.lgamma(2 * n + 1))
+                self.assertAlmostEqual(cos_coefficients[n], expected_coefficient, places=10)
+
+    def test_large_index(self):
+        """Test that coefficients are finite beyond the float range of B_2n."""
+        coefficients, signs = LogCoefficientTable().ensure(200)
+        self.assertTrue(math.isfinite(coefficients[200]))
+        # |T_n| ~ (x/pi)^(2n) / n, so c_n ~ -2n*ln(pi) - ln(n)
+        self.assertAlmostEqual(coefficients[200], -400 * math.log(math.pi) - math.log(200), places=6)
+
+    def test_sources_agree(self):
+        """Test that the asymptotic coefficients match the ones from exact Bernoulli numbers."""
+        asymptotic, asymptotic_signs = LogCoefficientTable().ensure(150)
+        exact, exact_signs = LogCoefficientTable(source='exact').ensure(150)
+        self.assertEqual(asymptotic_signs, exact_signs)
+        for n in range(1, 151):
+            with self.subTest(n=n):
+                self.assertAlmostEqual(asymptotic[n], exact[n], delta=1e-13 * abs(exact[n]))
+        with self.assertRaises(ValueError):
+            LogCoefficientTable(source='float')
+
+    def test_save_and_load(self):
+        """Test that a saved table loads back unchanged."""
+        table = LogCoefficientTable()
+        table.ensure(20)
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            filename = tmp_file.name
+        try:
+            table.save(filename)
+            loaded_table = LogCoefficientTable()
+            loaded_table.load(filename)
+            self.assertEqual(len(loaded_table), 20)
+            self.assertEqual(loaded_table.coefficients, table.coefficients)
+            self.assertEqual(loaded_table.signs, table.signs)
+            self.assertEqual(loaded_table.cos_coefficients, table.cos_coefficients)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump({'version': -1, 'coefficients': [], 'signs': []}, f)
+            with self.assertRaises(ValueError):
+                loaded_table.load(filename)
+        finally:
+            os.remove(filename)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch
 import os
-from main import main
+from main import main, RESULTS_INDEX_SUFFIX
 
 class TestMainProgram(unittest.TestCase):
     @patch('builtins.input', side_effect=[
@@ -28,14 +28,32 @@ class TestMainProgram(unittest.TestCase):
         filename = 'test1'
         try:
             # Remove file if it exists
-            if os.path.exists(filename):
-                os.remove(filename)
+            for name in (filename, filename + RESULTS_INDEX_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
             with patch('builtins.print') as mock_print:
                 main()
                 mock_print.assert_any_call(f"Data saved to file '{filename}'. Total number of entries: 1")
         finally:
-            if os.path.exists(filename):
-                os.remove(filename)
+            for name in (filename, filename + RESULTS_INDEX_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    @patch('builtins.input', side_effect=[
+        '0.5',   # x input
+        '0.001', # e input
+        'Кінець', # End the program
+        'Yes',    # Save results
+        'a.b',    # Invalid filename
+        'Кінець', # End the program
+        'No'     # Do not save results
+    ])
+    def test_main_invalid_new_filename(self, mock_input):
+        """Test that a new file name with other characters is rejected like any other results file name."""
+        with patch('builtins.print') as mock_print:
+            main()
+            mock_print.assert_any_call("Filename must contain only Latin/Ukrainian letters and digits.")
+        self.assertFalse(os.path.exists('a.b'))
 
 if __name__ == '__main__':
     unittest.main()
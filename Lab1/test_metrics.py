@@ -0,0 +1,63 @@
+import unittest
+from main import (enable_metrics, disable_metrics, stats, reset_stats, format_stats, compute_ln_sin_x,
+                  compute_bernoulli_numbers_generator, BernoulliTable, LOG_COEFFICIENT_TABLE, BERNOULLI_TABLE, PrimeSieve, LogCoefficientTable)
+import itertools
+from unittest.mock import patch
+
+class TestMetrics(unittest.TestCase):
+    def tearDown(self):
+        disable_metrics()
+        reset_stats()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded while metrics are disabled."""
+        reset_stats()
+        compute_ln_sin_x(0.5, 1e-10)
+        self.assertEqual(stats(), {'timers': {}, 'counters': {}})
+
+    def test_series_stages(self):
+        """Test the term counters and stage timers of a cold computation."""
+        BERNOULLI_TABLE.clear()
+        LOG_COEFFICIENT_TABLE.clear()
+        enable_metrics()
+        f_x_e, N = compute_ln_sin_x(1.0, 1e-12)
+        snapshot = stats()
+        self.assertEqual(snapshot['counters']['terms_evaluated'], N)
+        self.assertEqual(snapshot['counters']['terms_underflowed'], 0)
+        for stage in ['term_loop', 'term_count']:
+            self.assertIn(stage, snapshot['timers'])
+        self.assertIn('term_loop', format_stats(snapshot))
+        reset_stats()
+        LogCoefficientTable(source='exact').ensure(20)
+        snapshot = stats()
+        self.assertGreater(snapshot['counters']['bernoulli_cache_misses'], 0)
+        self.assertIn('decimal_to_float', snapshot['timers'])
+        reset_stats()
+        LogCoefficientTable(source='exact').ensure(20)
+        self.assertNotIn('bernoulli_cache_misses', stats()['counters'])
+
+    def test_bernoulli_stages(self):
+        """Test the sieve, factorial and cache counters of Bernoulli generation."""
+        enable_metrics()
+        with patch('main.PRIME_SIEVE', PrimeSieve()):
+            list(itertools.islice(compute_bernoulli_numbers_generator(), 100))
+        snapshot = stats()
+        self.assertGreater(snapshot['counters']['sieve_extensions'], 0)
+        for stage in ['prime_sieve', 'decimal_factorial', 'zeta_product']:
+            self.assertGreaterEqual(snapshot['timers'][stage], 0.0)
+        table = BernoulliTable()
+        table.get(10)
+        table.get(10)
+        snapshot = stats()
+        self.assertEqual(snapshot['counters']['bernoulli_cache_hits'], 1)
+
+    def test_callback(self):
+        """Test that the callback receives every sample."""
+        samples = []
+        enable_metrics(lambda kind, name, value: samples.append((kind, name, value)))
+        f_x_e, N = compute_ln_sin_x(0.3, 1e-8)
+        self.assertIn(('counter', 'terms_evaluated', N), samples)
+        self.assertTrue(any(kind == 'timer' and name == 'term_loop' for kind, name, value in samples))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from main import PrimeSieve, prime_sieve, von_staudt_clausen_denominator
+import threading
+
+def naive_primes(n):
+    return [m for m in range(2, n + 1) if all(m % k for k in range(2, int(m ** 0.5) + 1))]
+
+class TestPrimeSieve(unittest.TestCase):
+    def test_primes(self):
+        """Test the sieve against trial division, across several segments."""
+        expected = naive_primes(20000)
+        sieve = PrimeSieve()
+        sieve.SEGMENT_SIZE = 1000  # Force many segments
+        for bound in [0, 1, 2, 3, 10, 97, 1000, 5001, 20000]:
+            with self.subTest(bound=bound):
+                self.assertEqual(list(sieve.primes_up_to(bound)), [p for p in expected if p <= bound])
+        self.assertEqual(prime_sieve(20000), expected)
+        self.assertEqual([m for m in range(20000) if m in sieve], expected)
+
+    def test_incremental_extension(self):
+        """Test that extending keeps the primes found before and does not shrink."""
+        sieve = PrimeSieve(1000)
+        primes = sieve.primes
+        first_primes = list(primes)
+        sieve.extend(100000)
+        self.assertIs(sieve.primes, primes)
+        self.assertEqual(primes[:len(first_primes)], first_primes)
+        self.assertEqual(len(primes), 9592)  # pi(10^5)
+        limit = sieve.limit
+        sieve.extend(10)
+        self.assertEqual(sieve.limit, limit)
+
+    def test_von_staudt_clausen_denominator(self):
+        """Test the von Staudt-Clausen denominators over a sieve and over a plain set of primes."""
+        sieve = PrimeSieve()
+        sieve.extend(61)
+        denominators = {2: 6, 4: 30, 6: 42, 10: 66, 12: 2730, 60: 56786730}
+        for n, d in denominators.items():
+            with self.subTest(n=n):
+                self.assertEqual(von_staudt_clausen_denominator(n, sieve), d)
+                self.assertEqual(von_staudt_clausen_denominator(n, set(sieve.primes_up_to(n + 1))), d)
+
+    def test_concurrent_extension(self):
+        """Test that several threads can extend the same sieve."""
+        sieve = PrimeSieve()
+        threads = [threading.Thread(target=sieve.extend, args=(bound,)) for bound in range(10000, 200001, 10000)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(list(sieve.primes_up_to(200000))), 17984)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from main import (ResultsStore, save_results_to_store, export_results_store, save_session, read_results_store_index,
+                  RESULTS_STORE_SUFFIX)
+import datetime
+import io
+import os
+import random
+import tempfile
+from unittest.mock import patch
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'store' + RESULTS_STORE_SUFFIX)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def results(self, xs, e=1e-6):
+        return [{'x': x, 'e': e, 'f_x_e': -x, 'N': i} for i, x in enumerate(xs)]
+
+    def test_append_and_read(self):
+        """Test that appended records read back in order with their dates."""
+        first_day = datetime.date(2024, 3, 1)
+        self.assertEqual(save_results_to_store(self.filename, self.results([0.5, 0.1]), first_day), 2)
+        self.assertEqual(save_results_to_store(self.filename, self.results([0.3])), 3)
+        store = ResultsStore(self.filename)
+        try:
+            self.assertEqual(len(store), 3)
+            self.assertEqual(store.record(0), {'date': first_day, 'x': 0.5, 'e': 1e-6, 'f_x_e': -0.5, 'N': 0})
+            self.assertEqual(store.record(2)['date'], datetime.date.today())
+            with self.assertRaises(IndexError):
+                store.record(3)
+        finally:
+            store.close()
+
+    def test_queries_match_full_scan(self):
+        """Test range queries through the indices against a filtered full scan."""
+        rng = random.Random(1)
+        days = [datetime.date(2024, 1, 1) + datetime.timedelta(days=k) for k in range(10)]
+        expected = []
+        for day in days:
+            results = [{'x': rng.uniform(-3, 3), 'e': rng.choice([1e-3, 1e-10, 1e-14]), 'f_x_e': 0.0, 'N': 1}
+                       for _ in range(50)]
+            save_results_to_store(self.filename, results, day)
+            expected += [dict(result, date=day) for result in results]
+        store = ResultsStore(self.filename)
+        try:
+            self.assertEqual(list(store.index('x')), sorted(range(500), key=lambda i: expected[i]['x']))
+            queries = [
+                {'x_min': -0.5, 'x_max': 1.0},
+                {'x_min': 2.0, 'max_e': 1e-10},
+                {'x_max': -2.5},
+                {'date_min': days[3], 'date_max': days[5]},
+                {'date_min': days[8], 'max_e': 1e-3},
+                {'max_e': 1e-14},
+            ]
+            for query in queries:
+                with self.subTest(query=query):
+                    matches = [r for r in expected
+                               if query.get('x_min', -10) <= r['x'] <= query.get('x_max', 10)
+                               and query.get('date_min', days[0]) <= r['date'] <= query.get('date_max', days[-1])
+                               and r['e'] <= query.get('max_e', 1)]
+                    key = (lambda r: (r['x'], r['date'], r['e']))
+                    self.assertEqual(sorted(store.query(**query), key=key), sorted(matches, key=key))
+                    self.assertGreater(len(matches), 0)
+        finally:
+            store.close()
+
+    def test_stale_index_and_partial_record(self):
+        """Test that a stale index is rebuilt and a torn append is dropped."""
+        save_results_to_store(self.filename, self.results([0.4, 0.2]))
+        os.remove(self.filename + ResultsStore.INDEX_SUFFIXES['x'])
+        with open(self.filename, 'ab') as f:
+            f.write(b'\x00' * 7)  # Interrupted append
+        store = ResultsStore(self.filename)
+        try:
+            self.assertEqual(len(store), 2)
+            self.assertEqual([r['x'] for r in store.query(x_min=0.0)], [0.2, 0.4])
+        finally:
+            store.close()
+        self.assertEqual(save_results_to_store(self.filename, self.results([0.3])), 3)
+        self.assertEqual(list(read_results_store_index(self.filename, 'x', 3)), [1, 2, 0])
+
+    def test_append_to_large_store(self):
+        """Test that appending to a large store merges into its indices instead of rebuilding them."""
+        rng = random.Random(2)
+        save_results_to_store(self.filename, self.results([rng.uniform(-3, 3) for _ in range(200000)]))
+        new_xs = [rng.uniform(-3, 3) for _ in range(3)]
+        with patch.object(ResultsStore, 'index', side_effect=AssertionError("index rebuilt")):
+            self.assertEqual(save_results_to_store(self.filename, self.results(new_xs)), 200003)
+        store = ResultsStore(self.filename)
+        try:
+            keys = [store.key(i, 'x') for i in range(len(store))]
+            self.assertEqual(list(read_results_store_index(self.filename, 'x', 200003)),
+                             sorted(range(200003), key=keys.__getitem__))
+            self.assertEqual(sorted(list(read_results_store_index(self.filename, 'date', 200003))[-3:]),
+                             [200000, 200001, 200002])
+        finally:
+            store.close()
+
+    def test_invalid_file(self):
+        """Test that a file that is not a results store is rejected."""
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a results store')
+        with self.assertRaises(ValueError):
+            ResultsStore(self.filename)
+        with self.assertRaises(ValueError):
+            save_results_to_store(self.filename, self.results([0.5]))
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), b'not a results store')
+
+    def test_export_and_save_session(self):
+        """Test that save_session writes both formats and export streams text lines."""
+        text_name = os.path.join(self.directory.name, 'res')
+        results = self.results([0.25, 1.5, -0.75])
+        self.assertEqual(save_session(text_name, results, store=True), 3)
+        output = io.StringIO()
+        self.assertEqual(export_results_store(text_name + RESULTS_STORE_SUFFIX, output, x_min=0.0), 2)
+        with open(text_name, 'r', encoding='utf-8') as f:
+            text_lines = f.readlines()
+        self.assertEqual(output.getvalue().splitlines(), [text_lines[0].rstrip('\n'), text_lines[1].rstrip('\n')])
+
+if __name__ == '__main__':
+    unittest.main()
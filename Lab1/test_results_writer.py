@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import call, patch
+from main import ResultsWriter, main, results_filename_error, save_session, RESULTS_INDEX_SUFFIX
+import os
+import tempfile
+import threading
+
+class TestResultsWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'res')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writes_every_result(self):
+        """Test that every queued result reaches the file before close returns."""
+        writer = ResultsWriter(self.filename, max_pending=4)
+        for k in range(50):
+            writer.put({'x': k / 100, 'e': 0.001, 'f_x_e': -1.0, 'N': k})
+        self.assertEqual(writer.close(), 50)
+        self.assertEqual(writer.close(), 50)
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        self.assertEqual([int(line.rsplit(',', 1)[1]) for line in lines], list(range(50)))
+        with self.assertRaises(ValueError):
+            writer.put({'x': 0.5, 'e': 0.001, 'f_x_e': -1.0, 'N': 1})
+
+    def test_group_commit(self):
+        """Test that results queued during a slow save are committed together."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_save(*args):
+            started.set()
+            release.wait(5)
+            return save_session(*args)
+
+        with patch('main.save_session', side_effect=slow_save):
+            writer = ResultsWriter(self.filename)
+            writer.put({'x': 0.1, 'e': 0.001, 'f_x_e': -1.0, 'N': 1})
+            started.wait(5)
+            for k in range(20):
+                writer.put({'x': 0.2, 'e': 0.001, 'f_x_e': -1.0, 'N': k})  # Does not wait for the disk
+            release.set()
+            self.assertEqual(writer.close(), 21)
+        self.assertEqual(writer.commits, 2)
+        self.assertEqual(writer.written, 21)
+
+    def test_filename_rules(self):
+        """Test the five-character filename rules of write-through files."""
+        self.assertIsNone(results_filename_error('res1'))
+        self.assertIsNotNone(results_filename_error('toolong'))
+        self.assertIsNotNone(results_filename_error('a.b'))
+        with self.assertRaises(ValueError):
+            main(write_through='bad/name')
+
+    @patch('builtins.input', side_effect=[
+        '0.5',   # x input
+        '0.001', # e input
+        '1.0',   # x input
+        '0.001', # e input
+        'Кінець', # End the program
+    ])
+    def test_main_write_through(self, mock_input):
+        """Test that main writes results as they are computed and only finalizes on exit."""
+        filename = 'wt1'
+        try:
+            with patch('builtins.print') as mock_print:
+                main(write_through=filename)
+                mock_print.assert_any_call(f"Data saved to file '{filename}'. Total number of entries: 2")
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 2)
+        finally:
+            for name in (filename, filename + RESULTS_INDEX_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    @patch('builtins.input', side_effect=[
+        '0.5',   # x input
+        '0.001', # e input
+        'Кінець', # End the program
+    ])
+    def test_main_write_through_failure(self, mock_input):
+        """Test that main reports a failed write instead of an empty session."""
+        with patch('main.save_session', return_value=None), patch('builtins.print') as mock_print:
+            main(write_through='wt2')
+        mock_print.assert_any_call("Failed to save 1 results to file 'wt2'.")
+        self.assertNotIn(call("No results to save."), mock_print.call_args_list)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from main import run_batch, read_batch_rows, compute_ln_sin_x, cli, RESULTS_INDEX_SUFFIX
+import io
+import os
+import tempfile
+from unittest.mock import patch
+
+BATCH_INPUT = """x, e
+0.5, 0.001
+# comment
+
+1.0, 1e-10
+3.5, 0.01
+abc, 0.1
+-2.0, 1e-15
+1.0
+0.5, 2
+"""
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            self.filename = tmp_file.name
+        os.remove(self.filename)
+
+    def tearDown(self):
+        for name in (self.filename, self.filename + RESULTS_INDEX_SUFFIX):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_read_batch_rows(self):
+        """Test that rows are parsed lazily and malformed rows are flagged."""
+        rows = list(read_batch_rows(io.StringIO(BATCH_INPUT)))
+        self.assertEqual(rows[0], (2, 0.5, 0.001))
+        self.assertEqual([row[0] for row in rows if row[1] is None], [7, 9])
+        self.assertEqual(len(rows), 7)
+
+    def test_run_batch(self):
+        """Test that valid rows are saved and failing rows are reported, serially and in a pool."""
+        expected_lines = {
+            f"{x}, {e}, {compute_ln_sin_x(x, e)[0]:.12f}, {compute_ln_sin_x(x, e)[1]}"
+            for x, e in [(0.5, 0.001), (1.0, 1e-10), (-2.0, 1e-15)]
+        }
+        for workers in [1, 2]:
+            with self.subTest(workers=workers):
+                errors = io.StringIO()
+                saved, failed = run_batch(io.StringIO(BATCH_INPUT), self.filename, workers=workers,
+                                          max_in_flight=2, error_stream=errors)
+                self.assertEqual((saved, failed), (3, 4))
+                self.assertEqual(len(errors.getvalue().splitlines()), 4)
+                self.assertIn("Line 6:", errors.getvalue())
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    lines = {line.strip().split(', ', 1)[1] for line in f}
+                self.assertEqual(lines, expected_lines)
+                os.remove(self.filename)
+                os.remove(self.filename + RESULTS_INDEX_SUFFIX)
+
+    def test_batch_command(self):
+        """Test the --batch command-line mode."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as tmp_file:
+            tmp_file.write("0.5, 0.001\n1.0, 0.001\n")
+            input_name = tmp_file.name
+        try:
+            with patch('builtins.print') as mock_print:
+                cli(['--batch', input_name, '--out', self.filename, '--workers', '1'])
+                mock_print.assert_any_call(f"Saved 2 results to '{self.filename}', 0 rows failed")
+        finally:
+            os.remove(input_name)
+
+if __name__ == '__main__':
+    unittest.main()
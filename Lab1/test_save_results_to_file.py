@@ -1,5 +1,5 @@
 import unittest
-from main import save_results_to_file
+from main import save_results_to_file, read_results_index, RESULTS_INDEX_SUFFIX
 import os
 import tempfile
 import datetime
@@ -27,6 +27,30 @@ class TestSaveResultsToFile(unittest.TestCase):
         finally:
             # Clean up temporary file
             os.remove(filename)
+            os.remove(filename + RESULTS_INDEX_SUFFIX)
+
+    def test_entry_count_from_index(self):
+        """Test that the entry count comes from the sidecar index and survives external edits."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            filename = tmp_file.name
+        try:
+            session_results = [{'x': 1.0, 'e': 0.01, 'f_x_e': -0.841470985, 'N': 5}] * 3
+            self.assertEqual(save_results_to_file(filename, session_results), 3)
+            self.assertEqual(save_results_to_file(filename, session_results, fsync=True), 6)
+            index = read_results_index(filename)
+            self.assertEqual(index['entries'], 6)
+            self.assertEqual(index['size'], os.path.getsize(filename))
+            # An edit behind the index's back forces a recount
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write("01.01.2024, 0.5, 0.1, -0.7, 1\n")
+            self.assertEqual(save_results_to_file(filename, session_results), 10)
+            # A missing index is rebuilt
+            os.remove(filename + RESULTS_INDEX_SUFFIX)
+            self.assertEqual(save_results_to_file(filename, session_results[:1]), 11)
+            self.assertEqual(read_results_index(filename)['entries'], 11)
+        finally:
+            os.remove(filename)
+            os.remove(filename + RESULTS_INDEX_SUFFIX)
 
     def test_file_write_error(self):
         """Test handling of file write error."""
@@ -40,6 +64,9 @@ class TestSaveResultsToFile(unittest.TestCase):
         with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
             filename = tmp_file.name
         try:
+            # Existing entries without an index have to be read back to be counted
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write("01.01.2024, 0.5, 0.1, -0.7, 1\n")
             # Remove read permissions from the file
             os.chmod(filename, 0o222)  # Write-only
             session_results = [{'x': 1.0, 'e': 0.01, 'f_x_e': -0.841470985, 'N': 5}]
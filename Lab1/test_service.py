@@ -0,0 +1,107 @@
+import unittest
+from main import LnSinService, compute_ln_sin_x
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+class TestLnSinService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = LnSinService(workers=2, max_pending=4)
+        server = await self.service.start('127.0.0.1', 0)
+        self.port = server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def request_lines(self, requests):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        for request in requests:
+            writer.write((request if isinstance(request, str) else json.dumps(request)).encode('utf-8') + b'\n')
+        await writer.drain()
+        writer.write_eof()
+        responses = {}
+        while line := await reader.readline():
+            response = json.loads(line)
+            responses[response['id']] = response
+        writer.close()
+        return responses
+
+    async def test_requests(self):
+        """Test valid, invalid and malformed requests on one connection."""
+        responses = await self.request_lines([
+            {'id': 1, 'x': 0.5, 'e': 0.001},
+            {'id': 2, 'x': 1.0, 'e': 1e-12},
+            {'id': 3, 'x': 4.0, 'e': 0.001},
+            'not json',
+        ])
+        self.assertEqual(len(responses), 4)
+        for request_id, x, e in [(1, 0.5, 0.001), (2, 1.0, 1e-12)]:
+            f_x_e, N = compute_ln_sin_x(x, e)
+            self.assertAlmostEqual(responses[request_id]['f_x_e'], f_x_e, places=15)
+            self.assertEqual(responses[request_id]['N'], N)
+        self.assertIn('error', responses[3])
+        self.assertIn('error', responses[None])
+
+    async def test_coalescing_and_concurrent_clients(self):
+        """Test that identical in-flight requests from several clients share one computation."""
+        release = threading.Event()
+
+        def slow_compute(x, e):
+            release.wait(5)
+            return compute_ln_sin_x(x, e)
+
+        with patch('main.SERIES_CACHE.compute', side_effect=slow_compute):
+            clients = [self.request_lines([{'id': i, 'x': 0.7, 'e': 1e-9}]) for i in range(5)]
+            gathered = asyncio.gather(*clients)
+            while self.service.stats['requests'] < 5:
+                await asyncio.sleep(0.01)
+            release.set()
+            results = await gathered
+        self.assertEqual(self.service.stats['computations'], 1)
+        self.assertEqual(self.service.stats['coalesced'], 4)
+        expected_f, expected_N = compute_ln_sin_x(0.7, 1e-9)
+        for i, responses in enumerate(results):
+            self.assertAlmostEqual(responses[i]['f_x_e'], expected_f, places=15)
+
+    async def test_unexpected_error(self):
+        """Test that an unexpected exception is answered as an error without closing the connection early."""
+
+        def compute(x, e):
+            if x == 0.3:
+                raise RuntimeError("executor shut down")
+            return compute_ln_sin_x(x, e)
+
+        with patch('main.SERIES_CACHE.compute', side_effect=compute):
+            responses = await self.request_lines([
+                {'id': 1, 'x': 0.3, 'e': 0.001},
+                {'id': 2, 'x': 0.5, 'e': 0.001},
+            ])
+        self.assertEqual(responses[1]['error'], "executor shut down")
+        self.assertEqual(responses[2]['N'], compute_ln_sin_x(0.5, 0.001)[1])
+
+    async def test_backpressure(self):
+        """Test that the server stops reading requests while the queue of pending computations is full."""
+        release = threading.Event()
+
+        def slow_compute(x, e):
+            release.wait(5)
+            return compute_ln_sin_x(x, e)
+
+        with patch('main.SERIES_CACHE.compute', side_effect=slow_compute):
+            client = asyncio.create_task(self.request_lines(
+                [{'id': i, 'x': 0.1 + i / 100, 'e': 1e-6} for i in range(12)]))
+            # Two requests are computing, four are queued and one waits to be queued
+            limit = self.service.workers + self.service.max_pending + 1
+            while self.service.stats['requests'] < limit:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            self.assertEqual(self.service.stats['requests'], limit)
+            self.assertTrue(self.service._queue.full())
+            release.set()
+            responses = await client
+        self.assertEqual(sorted(responses), list(range(12)))
+        self.assertEqual(self.service.stats['computations'], 12)
+
+if __name__ == '__main__':
+    unittest.main()